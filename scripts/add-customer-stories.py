@@ -8,21 +8,46 @@ from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+from contextlib import nullcontext, redirect_stdout
+import argparse
 import os
-
-# ChatNIL brand color
-CHATNIL_ORANGE = RGBColor(249, 115, 22)  # #F97316
-DARK_GRAY = RGBColor(31, 41, 55)
+import sys
+
+from chatnil_docs.anchors import insert_at_anchor, section_xml
+from chatnil_docs.memprofile import MemoryProfiler
+from chatnil_docs.merge import merge_into, prune_unused
+from chatnil_docs.sections import parse_selection, select_sections
+from chatnil_docs.streaming import write_docx
+from chatnil_docs.template import blank_document
+from chatnil_docs.theme import CHATNIL_ORANGE, DARK_GRAY, ORANGE_TINT, apply_palette, bind_theme_colors, brand_theme_part
+from chatnil_docs.tracing import Tracer, annotate, traced_hook
+
+# Mail-merge fields (see chatnil_docs.mailmerge); pass {{field}} placeholders to build a template
+DEFAULT_FIELDS = {
+    'school_name': 'Atlantic Coast University',
+    'athlete_count': '650',
+    'sport_count': '22',
+}
+
+DEFAULT_DOCUMENT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docs', 'ChatNIL_Platform_Overview.docx'
+)
+
+def parse_field(text):
+    """Parse a --field NAME=VALUE argument"""
+    name, sep, value = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f'Expected NAME=VALUE, got {text!r}')
+    return name, value
 
 def set_cell_shading(cell, color):
-    """Set cell background color"""
+    """Set cell background color (an RGBColor or hex string)"""
     shading = OxmlElement('w:shd')
-    shading.set(qn('w:fill'), color)
+    shading.set(qn('w:fill'), str(color))
     cell._tc.get_or_add_tcPr().append(shading)
 
-def add_customer_stories(doc):
-    """Add Section 8: Customer Stories to the document"""
-
+def add_stories_intro(doc, fields):
+    """Section 8 heading, subtitle and introduction"""
     # Page break before new section
     doc.add_page_break()
 
@@ -50,7 +75,8 @@ def add_customer_stories(doc):
 
     doc.add_paragraph()
 
-    # ==================== JASMINE'S STORY ====================
+def add_jasmine_story(doc, fields):
+    """Jasmine's story: high school student"""
     heading = doc.add_heading("Jasmine's Story: \"I Almost Signed the Wrong Deal\"", 2)
     for run in heading.runs:
         run.font.color.rgb = DARK_GRAY
@@ -59,7 +85,7 @@ def add_customer_stories(doc):
     table = doc.add_table(rows=1, cols=1)
     table.style = 'Table Grid'
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
 
     p = cell.paragraphs[0]
     p.add_run('[Photo Placeholder]\n').bold = True
@@ -116,7 +142,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
     p = cell.paragraphs[0]
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
     run = p.add_run('"ChatNIL taught me what questions to ask before I even knew what questions to ask."')
@@ -131,7 +157,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'F97316')
+    set_cell_shading(cell, CHATNIL_ORANGE)
     p = cell.paragraphs[0]
     run = p.add_run('How ChatNIL Helped: ')
     run.bold = True
@@ -139,10 +165,8 @@ def add_customer_stories(doc):
     run2 = p.add_run('Discovery conversation taught state rules, 4-pillar education prepared her for college NIL, parent consent kept her family involved and protected.')
     run2.font.color.rgb = RGBColor(255, 255, 255)
 
-    doc.add_paragraph()
-    doc.add_page_break()
-
-    # ==================== DARIUS'S STORY ====================
+def add_darius_story(doc, fields):
+    """Darius's story: college athlete"""
     heading = doc.add_heading("Darius's Story: \"The $25,000 Red Flag\"", 2)
     for run in heading.runs:
         run.font.color.rgb = DARK_GRAY
@@ -151,7 +175,7 @@ def add_customer_stories(doc):
     table = doc.add_table(rows=1, cols=1)
     table.style = 'Table Grid'
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
 
     p = cell.paragraphs[0]
     p.add_run('[Photo Placeholder]\n').bold = True
@@ -207,7 +231,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
     p = cell.paragraphs[0]
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
     run = p.add_run('"That RED score saved my career. I almost threw away everything for $25K."')
@@ -222,7 +246,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'F97316')
+    set_cell_shading(cell, CHATNIL_ORANGE)
     p = cell.paragraphs[0]
     run = p.add_run('How ChatNIL Helped: ')
     run.bold = True
@@ -230,10 +254,8 @@ def add_customer_stories(doc):
     run2 = p.add_run('6-dimension scoring flagged the deal as RED (booster-connected, inflated FMV). AI explained the risks. Darius declined and found a legitimate deal instead.')
     run2.font.color.rgb = RGBColor(255, 255, 255)
 
-    doc.add_paragraph()
-    doc.add_page_break()
-
-    # ==================== MICHELLE'S STORY ====================
+def add_michelle_story(doc, fields):
+    """Michelle's story: parent"""
     heading = doc.add_heading("Michelle's Story: \"I Finally Understand What My Daughter Is Doing\"", 2)
     for run in heading.runs:
         run.font.color.rgb = DARK_GRAY
@@ -242,7 +264,7 @@ def add_customer_stories(doc):
     table = doc.add_table(rows=1, cols=1)
     table.style = 'Table Grid'
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
 
     p = cell.paragraphs[0]
     p.add_run('[Photo Placeholder]\n').bold = True
@@ -299,7 +321,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
     p = cell.paragraphs[0]
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
     run = p.add_run('"I went from \'What is NIL?\' to recommending ChatNIL to every parent I know."')
@@ -314,7 +336,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'F97316')
+    set_cell_shading(cell, CHATNIL_ORANGE)
     p = cell.paragraphs[0]
     run = p.add_run('How ChatNIL Helped: ')
     run.bold = True
@@ -322,10 +344,8 @@ def add_customer_stories(doc):
     run2 = p.add_run('Consent flow explained the platform clearly. Parent dashboard provided visibility without control. Activity feed showed education happening, not exploitation.')
     run2.font.color.rgb = RGBColor(255, 255, 255)
 
-    doc.add_paragraph()
-    doc.add_page_break()
-
-    # ==================== ANGELA'S STORY ====================
+def add_angela_story(doc, fields):
+    """Angela's story: compliance officer"""
     heading = doc.add_heading("Angela's Story: \"Zero Violations in Year One\"", 2)
     for run in heading.runs:
         run.font.color.rgb = DARK_GRAY
@@ -334,13 +354,13 @@ def add_customer_stories(doc):
     table = doc.add_table(rows=1, cols=1)
     table.style = 'Table Grid'
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
 
     p = cell.paragraphs[0]
     p.add_run('[Photo Placeholder]\n').bold = True
     p.add_run('Angela Washington, J.D.\n').bold = True
-    p.add_run('Compliance Officer • Atlantic Coast University\n')
-    p.add_run('D1 • 650 Athletes • 22 Sports')
+    p.add_run(f'Compliance Officer • {fields["school_name"]}\n')
+    p.add_run(f'D1 • {fields["athlete_count"]} Athletes • {fields["sport_count"]} Sports')
 
     doc.add_paragraph()
 
@@ -349,7 +369,7 @@ def add_customer_stories(doc):
     run = p.add_run('The Situation: ')
     run.bold = True
     p.add_run(
-        'New NCAA rules, new state laws, and 650 athletes who all think they\'re the next NIL millionaire. '
+        f'New NCAA rules, new state laws, and {fields["athlete_count"]} athletes who all think they\'re the next NIL millionaire. '
         'Angela\'s inbox is drowning.'
     )
 
@@ -373,7 +393,7 @@ def add_customer_stories(doc):
     run = p.add_run('The Journey: ')
     run.bold = True
     p.add_run(
-        'Angela onboards all 650 athletes over two weeks. The dashboard immediately shows 12 athletes in '
+        f'Angela onboards all {fields["athlete_count"]} athletes over two weeks. The dashboard immediately shows 12 athletes in '
         'RED status. She investigates: 8 are booster-connected deals, 4 have FMV issues. Athletes fix or '
         'decline the deals before signing. She exports NCAA-compliant reports with one click.'
     )
@@ -391,7 +411,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'FFF7ED')
+    set_cell_shading(cell, ORANGE_TINT)
     p = cell.paragraphs[0]
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
     run = p.add_run('"ChatNIL gave me my weekends back. I\'m not chasing athletes for paperwork anymore."')
@@ -406,7 +426,7 @@ def add_customer_stories(doc):
     doc.add_paragraph()
     table = doc.add_table(rows=1, cols=1)
     cell = table.rows[0].cells[0]
-    set_cell_shading(cell, 'F97316')
+    set_cell_shading(cell, CHATNIL_ORANGE)
     p = cell.paragraphs[0]
     run = p.add_run('How ChatNIL Helped: ')
     run.bold = True
@@ -414,23 +434,162 @@ def add_customer_stories(doc):
     run2 = p.add_run('Athletes self-validate deals. Real-time dashboard surfaces problems. Audit trail provides NCAA-ready documentation. Compliance at scale without additional staff.')
     run2.font.color.rgb = RGBColor(255, 255, 255)
 
+
+STORIES = [
+    ('stories_intro', add_stories_intro),
+    ('jasmine', add_jasmine_story),
+    ('darius', add_darius_story),
+    ('michelle', add_michelle_story),
+    ('angela', add_angela_story),
+]
+
+# Every story sits under the Section 8 heading in the intro (see chatnil_docs.sections)
+STORY_DEPENDENCIES = {name: ('stories_intro',) for name, _ in STORIES if name != 'stories_intro'}
+
+def add_customer_stories(doc, fields=None, section_hook=None, sections=None, store=None):
+    """Add Section 8: Customer Stories to the document
+
+    section_hook(name), if given, must return a context manager that wraps each story build.
+    sections, if given, names the stories to add; the intro they depend on is added too.
+    store, a chatnil_docs.content_store.StoredSections, supplies the stories it holds for its
+    audience and tenant and leaves out those it tags for other audiences.
+    """
+    fields = {**DEFAULT_FIELDS, **(fields or {})}
+    section_hook = traced_hook(section_hook)
+
+    selected = select_sections(STORIES, STORY_DEPENDENCIES, sections)
+    if store is not None:
+        selected = [(name, builder) for name, builder in selected if not store.excludes(name)]
+    for index, (name, builder) in enumerate(selected):
+        with section_hook(name):
+            if index > 1:
+                doc.add_paragraph()
+                doc.add_page_break()
+            if store is not None and name in store:
+                store.splice(doc, name, fields)
+            else:
+                builder(doc, fields)
+
+    bind_theme_colors(doc.element.body)
     return doc
 
-def main():
-    # Open existing document
-    input_path = '/Users/verrelbricejr./ChatNIL.io/docs/ChatNIL_Platform_Overview.docx'
-    output_path = '/Users/verrelbricejr./ChatNIL.io/docs/ChatNIL_Platform_Overview.docx'
+def insert_customer_stories(input_path, output_path, before_heading=None, before_bookmark=None, fields=None,
+                            sections=None, store=None):
+    """Splice Section 8 in before an existing heading or bookmark instead of appending it
+
+    The fragment's colors are bound to the brand theme, so the target's theme gets the palette too.
+    """
+    fragment = section_xml(add_customer_stories, fields, sections=sections, store=store)
+    return insert_at_anchor(input_path, output_path, fragment,
+                            heading=before_heading, bookmark=before_bookmark, transform=brand_theme_part)
+
+def update_document(input_path, output_path=None, fields=None, section_hook=None,
+                    before_heading=None, before_bookmark=None, sections=None, store=None):
+    """Add Section 8 to the document at input_path and save it to output_path (default: in place)
+
+    output_path may also be a writable binary stream (BytesIO, socket file, stdout).
+    """
+    output_path = output_path or input_path
+    streaming = hasattr(output_path, 'write')
+    section_hook = traced_hook(section_hook)
+    if not streaming:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    if before_heading or before_bookmark:
+        print(f'Inserting Customer Stories section into {input_path}...')
+        with section_hook('insert'):
+            insert_customer_stories(input_path, output_path, before_heading, before_bookmark, fields, sections,
+                                    store)
+            if not streaming:
+                annotate(bytes=os.path.getsize(output_path))
+        return output_path
 
     print(f'Opening {input_path}...')
-    doc = Document(input_path)
+    with section_hook('open'):
+        doc = Document(input_path)
+        annotate(bytes=os.path.getsize(input_path))
 
+    # Build against a scratch document, then merge so styles, numbering and relationships are
+    # reused from the target by content hash instead of duplicating or colliding with its own
     print('Adding Customer Stories section...')
-    add_customer_stories(doc)
+    stories = add_customer_stories(blank_document(), fields, section_hook=section_hook, sections=sections,
+                                   store=store)
+    with section_hook('merge'):
+        merge_into(doc, stories)
+        prune_unused(doc)
+        apply_palette(doc)
+
+    if streaming:
+        print('Streaming the document...')
+        with section_hook('save'):
+            annotate(bytes=write_docx(doc, output_path))
+        return output_path
 
     print(f'Saving to {output_path}...')
-    doc.save(output_path)
+    with section_hook('save'):
+        doc.save(output_path)
+        annotate(bytes=os.path.getsize(output_path))
+    return output_path
 
-    print('Done! Customer Stories section added.')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Add the Customer Stories section to the overview document')
+    parser.add_argument('-i', '--input', default=DEFAULT_DOCUMENT_PATH,
+                        help='Document to amend (default: docs/ChatNIL_Platform_Overview.docx)')
+    parser.add_argument('-o', '--output',
+                        help='Output .docx path, or - to stream to stdout (default: overwrite the input)')
+    parser.add_argument('--before-heading', metavar='TEXT',
+                        help='Insert before this heading instead of appending at the end')
+    parser.add_argument('--before-bookmark', metavar='NAME',
+                        help='Insert before this bookmark instead of appending at the end')
+    parser.add_argument('--field', action='append', type=parse_field, default=[], metavar='NAME=VALUE',
+                        help=f'Mail-merge field override ({", ".join(DEFAULT_FIELDS)}); repeatable')
+    parser.add_argument('--mem-profile', metavar='REPORT',
+                        help='Write per-section tracemalloc stats as JSON to REPORT (- for stdout, stderr with -o -)')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write timing spans as a Chrome trace (.json) or JSONL (.jsonl)')
+    parser.add_argument('--tenant', help='Tenant ID recorded on every trace span (and used with --content-store)')
+    parser.add_argument('--content-store', metavar='DB',
+                        help='Take stories from this content store (chatnil_docs.content_store) where it has them')
+    parser.add_argument('--audience', help='With --content-store, leave out stories tagged for other audiences')
+    parser.add_argument('--sections', type=parse_selection, metavar='NAME,...',
+                        help=f'Add only these stories and the intro ({", ".join(n for n, _ in STORIES)})')
+    args = parser.parse_args(argv)
+    try:
+        select_sections(STORIES, STORY_DEPENDENCIES, args.sections)
+    except ValueError as e:
+        parser.error(str(e))
+    store = None
+    if args.content_store:
+        from chatnil_docs.content_store import open_sections
+        try:
+            store = open_sections(args.content_store, 'stories', args.audience, args.tenant or '')
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+    elif args.audience:
+        parser.error('--audience needs --content-store')
+
+    profiler = MemoryProfiler() if args.mem_profile else None
+    tracer = Tracer(script='add-customer-stories', tenant=args.tenant)
+    to_stdout = args.output == '-'
+    output = sys.stdout.buffer if to_stdout else args.output
+    # Streaming to stdout: progress messages go to stderr so the package bytes stay clean
+    with tracer.activate(), redirect_stdout(sys.stderr) if to_stdout else nullcontext():
+        update_document(
+            args.input, output, dict(args.field),
+            section_hook=profiler.section if profiler else None,
+            before_heading=args.before_heading, before_bookmark=args.before_bookmark, sections=args.sections,
+            store=store,
+        )
+    output_path = args.output or args.input
+    if args.trace:
+        tracer.write(args.trace)
+
+    if profiler:
+        # With the document on stdout, a '-' report goes to stderr instead of trailing the package
+        with redirect_stdout(sys.stderr) if to_stdout else nullcontext():
+            profiler.write_report(args.mem_profile, script='add-customer-stories', output=output_path)
+
+    print('Done! Customer Stories section added.', file=sys.stderr if to_stdout else sys.stdout)
     return output_path
 
 if __name__ == '__main__':
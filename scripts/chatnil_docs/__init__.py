@@ -0,0 +1,26 @@
+"""
+ChatNIL document tooling
+Shared building blocks for the partner overview and customer stories generators
+"""
+
+import importlib.util
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_script(name):
+    """Import one of the hyphenated generator scripts (e.g. 'generate-partner-overview') as a module"""
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    path = os.path.join(SCRIPTS_DIR, f'{name}.py')
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
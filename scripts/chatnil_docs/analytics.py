@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Grouped compliance analytics report
+Aggregates a deal dataset per sport or school with NumPy (status counts, mean dimension scores,
+FMV outliers) and renders the results as branded tables through add_table().
+
+Usage: python -m chatnil_docs.analytics deals.jsonl report.docx [--by sport|school] [--title ...]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from chatnil_docs import load_script
+from chatnil_docs.charts import add_dimension_chart, add_score_histogram
+from chatnil_docs.deals import (
+    DIMENSIONS, FMV_RED_FLAG_RATIO, STATUS_GREEN, STATUS_LABELS, STATUS_YELLOW, STATUSES, read_deals,
+)
+from chatnil_docs.template import blank_document
+from chatnil_docs.theme import brand
+
+GROUP_LABELS = {'sport': 'Sport', 'school': 'School'}
+DEFAULT_TITLE = 'Compliance Analytics'
+OPTIONAL_TEXT_COLUMNS = {'division', 'platform', 'deal_type', 'deal_date'}
+OPTIONAL_NUMERIC_COLUMNS = {'followers', 'total_followers', 'engagement_rate'}
+OPTIONAL_BOOLEAN_COLUMNS = {'inflated'}
+
+def deal_columns(deals):
+    """Load deal records into NumPy column arrays"""
+    deals = list(deals)
+    count = len(deals)
+
+    def numbers(key, default=0.0):
+        return np.fromiter((float(d.get(key) or default) for d in deals), dtype=np.float64, count=count)
+
+    columns = {
+        'deal_id': np.array([str(d.get('deal_id', i)) for i, d in enumerate(deals)], dtype=object),
+        'athlete_id': np.array([str(d['athlete_id']) for d in deals], dtype=object),
+        'school': np.array([d.get('school', '') for d in deals], dtype=object),
+        'sport': np.array([d.get('sport', '') for d in deals], dtype=object),
+        'compensation': numbers('compensation'),
+        'fmv_estimated': numbers('fmv_estimated'),
+        'is_booster_connected': np.fromiter(
+            (bool(d.get('is_booster_connected')) for d in deals), dtype=bool, count=count
+        ),
+    }
+    for column, _, _ in DIMENSIONS:
+        columns[column] = numbers(column)
+    # Optional columns (e.g. from chatnil_docs.synthetic), kept only when the dataset has them
+    present = set().union(*(d.keys() for d in deals))
+    for column in OPTIONAL_TEXT_COLUMNS & present:
+        columns[column] = np.array([str(d.get(column, '')) for d in deals], dtype=object)
+    for column in OPTIONAL_NUMERIC_COLUMNS & present:
+        columns[column] = numbers(column)
+    for column in OPTIONAL_BOOLEAN_COLUMNS & present:
+        columns[column] = np.fromiter((bool(d.get(column)) for d in deals), dtype=bool, count=count)
+    return columns
+
+def load_columns(path):
+    """Column arrays for a .jsonl, .csv or columnar .npz (see chatnil_docs.synthetic) dataset"""
+    if path.endswith('.npz'):
+        from chatnil_docs.synthetic import read_npz
+        return read_npz(path)
+    return deal_columns(read_deals(path))
+
+def score_columns(columns):
+    """Combined scores (Math.round semantics) and status codes (0 green, 1 yellow, 2 red)"""
+    weights = np.array([weight for _, _, weight in DIMENSIONS])
+    scores = np.column_stack([columns[column] for column, _, _ in DIMENSIONS])
+    total = np.floor(scores @ weights + 0.5)
+    status = np.where(total >= STATUS_GREEN, 0, np.where(total >= STATUS_YELLOW, 1, 2))
+    return scores, total, status
+
+def aggregate(columns, by='sport', outlier_limit=50):
+    """Group-by aggregates for one grouping column"""
+    scores, total, status = score_columns(columns)
+    groups, group_idx = np.unique(columns[by].astype(str), return_inverse=True)
+    n_groups = len(groups)
+
+    deal_counts = np.bincount(group_idx, minlength=n_groups)
+    status_counts = np.bincount(group_idx * 3 + status, minlength=n_groups * 3).reshape(n_groups, 3)
+    safe_counts = np.maximum(deal_counts, 1)
+    dimension_means = np.column_stack([
+        np.bincount(group_idx, weights=scores[:, i], minlength=n_groups) / safe_counts
+        for i in range(len(DIMENSIONS))
+    ])
+    total_means = np.bincount(group_idx, weights=total, minlength=n_groups) / safe_counts
+    overall_means = scores.mean(axis=0) if len(scores) else np.zeros(len(DIMENSIONS))
+
+    fmv = columns['fmv_estimated']
+    ratio = np.divide(columns['compensation'], fmv, out=np.full(len(fmv), np.nan), where=fmv > 0)
+    fmv_flag = ratio > FMV_RED_FLAG_RATIO
+    outliers = np.flatnonzero(fmv_flag)
+    outliers = outliers[np.argsort(-ratio[outliers], kind='stable')][:outlier_limit]
+
+    red = status == 2
+    athletes = columns['athlete_id']
+    summary = {
+        'deals': int(len(total)),
+        'athletes': int(len(np.unique(athletes))),
+        'red_athletes': int(len(np.unique(athletes[red]))),
+        'red_booster_athletes': int(len(np.unique(athletes[red & columns['is_booster_connected']]))),
+        'red_fmv_athletes': int(len(np.unique(athletes[red & fmv_flag]))),
+        'fmv_flagged_deals': int(fmv_flag.sum()),
+    }
+    return {
+        'by': by,
+        'groups': groups,
+        'deal_counts': deal_counts,
+        'status_counts': status_counts,
+        'dimension_means': dimension_means,
+        'total_means': total_means,
+        'overall_means': overall_means,
+        'outliers': outliers,
+        'ratio': ratio,
+        'total': total,
+        'status': status,
+        'summary': summary,
+    }
+
+def add_analytics_report(doc, columns, report, title=DEFAULT_TITLE):
+    """Render the aggregates as branded tables"""
+    overview = load_script('generate-partner-overview')
+    label = GROUP_LABELS.get(report['by'], report['by'].title())
+    summary = report['summary']
+
+    overview.create_heading(doc, title, 1)
+    doc.add_paragraph(
+        f'{summary["athletes"]} athletes • {summary["deals"]} deals • {len(report["groups"])} {label.lower()} groups'
+    )
+
+    overview.create_heading(doc, 'Needs Attention', 2)
+    overview.add_table(doc, ['Metric', 'Count'], [
+        ['Athletes in RED status', summary['red_athletes']],
+        ['RED athletes with booster-connected deals', summary['red_booster_athletes']],
+        ['RED athletes with FMV issues', summary['red_fmv_athletes']],
+        [f'Deals above {FMV_RED_FLAG_RATIO:g}x FMV', summary['fmv_flagged_deals']],
+    ], first_col_bold=True)
+
+    add_score_histogram(doc, report['total'])
+    add_dimension_chart(doc, [('All deals', report['overall_means'])])
+
+    overview.create_heading(doc, f'Status by {label}', 2)
+    rows = []
+    for group, count, (green, yellow, red) in zip(report['groups'], report['deal_counts'], report['status_counts']):
+        rows.append([group, count, green, yellow, red, f'{100.0 * red / count:.0f}%' if count else '-'])
+    overview.add_table(
+        doc, [label, 'Deals', STATUS_LABELS['green'], STATUS_LABELS['yellow'], STATUS_LABELS['red'], '% RED'],
+        rows, first_col_bold=True, max_rows=overview.TABLE_PAGE_ROWS,
+    )
+
+    overview.create_heading(doc, f'Mean Dimension Scores by {label}', 2)
+    rows = [
+        [group, *(f'{value:.1f}' for value in means), f'{combined:.1f}']
+        for group, means, combined in zip(report['groups'], report['dimension_means'], report['total_means'])
+    ]
+    overview.add_table(
+        doc, [label, *(name for _, name, _ in DIMENSIONS), 'Combined'],
+        rows, first_col_bold=True, max_rows=overview.TABLE_PAGE_ROWS,
+    )
+
+    overview.create_heading(doc, 'FMV Outliers', 2)
+    if not len(report['outliers']):
+        doc.add_paragraph(f'No deals above {FMV_RED_FLAG_RATIO:g}x fair market value.')
+        return doc
+    rows = [
+        [
+            columns['deal_id'][i], columns['athlete_id'][i], columns[report['by']][i],
+            f'${columns["compensation"][i]:,.0f}', f'${columns["fmv_estimated"][i]:,.0f}',
+            f'{report["ratio"][i]:.1f}x', STATUS_LABELS[STATUSES[report['status'][i]]],
+        ]
+        for i in report['outliers']
+    ]
+    overview.add_table(
+        doc, ['Deal', 'Athlete', label, 'Compensation', 'FMV', 'Ratio', 'Status'],
+        rows, first_col_bold=True, max_rows=overview.TABLE_PAGE_ROWS,
+    )
+    return doc
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render a grouped compliance analytics report')
+    parser.add_argument('deals', help='Deal dataset (.jsonl, .csv or .npz)')
+    parser.add_argument('output', help='Output .docx path')
+    parser.add_argument('--by', choices=sorted(GROUP_LABELS), default='sport', help='Grouping column')
+    parser.add_argument('--title', default=DEFAULT_TITLE, help='Report heading')
+    parser.add_argument('--outliers', type=int, default=50, help='Maximum FMV outlier rows')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    columns = load_columns(args.deals)
+    report = aggregate(columns, by=args.by, outlier_limit=args.outliers)
+    print(f'Aggregated {report["summary"]["deals"]} deals in {time.perf_counter() - start:.2f}s')
+
+    doc = blank_document()
+    add_analytics_report(doc, columns, report, title=args.title)
+    brand(doc).save(args.output)
+    print(f'Report saved to: {args.output} ({time.perf_counter() - start:.2f}s total)')
+    return args.output
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Streaming anchor lookup and section splicing for existing .docx files
+word/document.xml is streamed with iterparse to find a named heading or bookmark, and the
+new section XML is spliced in at that byte position. No python-docx object tree is built
+for the target document, so amending a large document costs roughly one read and one write.
+"""
+
+from xml.etree.ElementTree import iterparse
+import io
+import os
+import re
+import zipfile
+
+from docx.oxml.ns import qn
+from lxml import etree
+
+from chatnil_docs.template import blank_document
+
+DOCUMENT_PART = 'word/document.xml'
+
+BODY = qn('w:body')
+PARAGRAPH = qn('w:p')
+PARAGRAPH_STYLE = qn('w:pStyle')
+TEXT = qn('w:t')
+BREAK = qn('w:br')
+SECTION_PROPERTIES = qn('w:sectPr')
+BOOKMARK_START = qn('w:bookmarkStart')
+VAL = qn('w:val')
+NAME = qn('w:name')
+TYPE = qn('w:type')
+
+TAG_RE = re.compile(rb'<(/?)([^\s/>!?]+)[^>]*?(/?)>')
+
+def is_heading(elem):
+    """True for a paragraph with one of the built-in Heading styles"""
+    style = elem.find(f'{qn("w:pPr")}/{PARAGRAPH_STYLE}')
+    return style is not None and style.get(VAL, '').startswith('Heading')
+
+def _is_page_break(elem):
+    """True for an otherwise empty paragraph holding only a page break"""
+    if elem.tag != PARAGRAPH or any(t.text for t in elem.iter(TEXT)):
+        return False
+    return any(br.get(TYPE) == 'page' for br in elem.iter(BREAK))
+
+def find_anchor(source, heading=None, bookmark=None, include_page_break=False):
+    """Return the index of the body-level block holding the heading or bookmark, or None
+
+    With include_page_break, a page break paragraph directly before the anchor counts as part
+    of it, so content inserted before the anchor lands ahead of the break.
+    """
+    if (heading is None) == (bookmark is None):
+        raise ValueError('Pass exactly one of heading or bookmark')
+
+    with zipfile.ZipFile(source) as zf, zf.open(DOCUMENT_PART) as f:
+        body = None
+        depth = 0
+        index = -1
+        previous_was_break = False
+        bookmark_index = None
+        for event, elem in iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == BODY:
+                    body = elem
+                elif body is not None:
+                    depth += 1
+                    if depth == 1:
+                        index += 1
+                    if bookmark is not None and elem.tag == BOOKMARK_START and elem.get(NAME) == bookmark:
+                        bookmark_index = index
+                continue
+
+            if body is None or elem is body:
+                continue
+            depth -= 1
+            if depth:
+                continue
+
+            # A complete body-level block
+            if bookmark_index is not None:
+                found = True
+            elif heading is not None and elem.tag == PARAGRAPH and is_heading(elem):
+                found = ''.join(t.text or '' for t in elem.iter(TEXT)).strip() == heading
+            else:
+                found = False
+            if found:
+                return index - 1 if include_page_break and previous_was_break else index
+            previous_was_break = _is_page_break(elem)
+            body.remove(elem)
+    return None
+
+def _block_offset(xml, block_index):
+    """Byte offset where body-level block number block_index starts (or the sectPr/</w:body>)"""
+    body_start = xml.index(b'<w:body>') + len(b'<w:body>')
+    depth = 0
+    index = -1
+    for match in TAG_RE.finditer(xml, body_start):
+        closing, name, self_closing = match.groups()
+        if closing:
+            if depth == 0:  # </w:body>
+                return match.start()
+            depth -= 1
+            continue
+        if depth == 0:
+            index += 1
+            if index == block_index or name == b'w:sectPr':
+                return match.start()
+        if not self_closing:
+            depth += 1
+    raise ValueError('Malformed document.xml: no closing </w:body>')
+
+def section_xml(builder, *args, **kwargs):
+    """Run builder(doc, ...) against a scratch document and return the body XML it produced"""
+    doc = blank_document()
+    builder(doc, *args, **kwargs)
+    return b''.join(etree.tostring(el) for el in doc.element.body if el.tag != SECTION_PROPERTIES)
+
+def splice(source, output, fragment, block_index, transform=None):
+    """Copy the package from source to output with fragment inserted before block block_index
+
+    transform(name, data), if given, may rewrite any other part on the way through.
+    """
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(output, 'w') as zout:
+        for info in zin.infolist():
+            data = zin.read(info)
+            if info.filename == DOCUMENT_PART:
+                offset = _block_offset(data, block_index)
+                data = data[:offset] + fragment + data[offset:]
+            elif transform is not None:
+                data = transform(info.filename, data)
+            zout.writestr(info, data)
+    return output
+
+def insert_at_anchor(source, output, fragment, heading=None, bookmark=None, position='before', transform=None):
+    """Splice fragment before or after a named heading or bookmark; append if it is missing"""
+    if position not in ('before', 'after'):
+        raise ValueError(f'Unknown position: {position}')
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    elif isinstance(source, str) and isinstance(output, str) and os.path.abspath(source) == os.path.abspath(output):
+        # Amending in place: read the package up front so the output can overwrite it
+        with open(source, 'rb') as f:
+            source = io.BytesIO(f.read())
+    index = find_anchor(source, heading=heading, bookmark=bookmark, include_page_break=position == 'before')
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    if index is None:
+        index = -1  # before sectPr, i.e. append
+    elif position == 'after':
+        index += 1
+    return splice(source, output, fragment, index, transform)
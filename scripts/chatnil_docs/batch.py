@@ -0,0 +1,305 @@
+"""
+Manifest-driven batch document generation
+A manifest (TOML or JSON) lists jobs; jobs run independently across -j worker processes and
+each one is reported with its timing and, on failure, the error.
+
+    [defaults]
+    fields = { document_date = "March 2026" }
+
+    [[jobs]]
+    name = "acu-overview"
+    tenant = "acu"             # recorded on trace spans (default: the job name)
+    type = "overview"          # overview | stories | analytics
+    output = "out/acu.docx"
+    stories = true             # overview only: append Section 8
+    sections = ["scoring"]     # overview and stories: build only these sections (and dependencies)
+    content_store = "content.db"  # overview and stories: take sections from this store (tenant as above)
+    audience = "compliance"    # with content_store: leave out sections tagged for other audiences
+    fields = { school_name = "Atlantic Coast University" }
+
+    [[jobs]]
+    type = "analytics"
+    input = "data/acu-deals.jsonl"
+    output = "out/acu-analytics.docx"
+    by = "sport"               # analytics only: sport | school
+    title = "ACU Analytics"    # analytics only (optional)
+
+Relative paths are resolved against the manifest's directory. Job names must be unique; with
+--checkpoint they key the resumable state (see chatnil_docs.checkpoint).
+
+Before the pool starts, the parent imports the generators, parses the blank template and
+renders the static fragments; workers are forked from it and share those pages copy-on-write
+instead of each importing python-docx and re-parsing everything.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import time
+import traceback
+
+from chatnil_docs import load_script
+from chatnil_docs.checkpoint import Checkpoint
+from chatnil_docs.files import file_sha256
+from chatnil_docs.template import blank_document, preload_template
+from chatnil_docs.theme import brand
+from chatnil_docs.tracing import Tracer, annotate, span, write_spans
+
+JOB_TYPES = ('overview', 'stories', 'analytics')
+
+def load_manifest(path):
+    """Read a TOML or JSON manifest and return its jobs with defaults and paths resolved"""
+    with open(path, 'rb') as f:
+        if path.endswith('.toml'):
+            import tomllib
+            manifest = tomllib.load(f)
+        else:
+            manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get('defaults', {})
+    jobs = []
+    names = set()
+    for index, spec in enumerate(manifest.get('jobs', [])):
+        job = {**defaults, **spec, 'fields': {**defaults.get('fields', {}), **spec.get('fields', {})}}
+        job.setdefault('name', f'job-{index + 1}')
+        if job['name'] in names:
+            raise ValueError(f'{job["name"]}: duplicate job name')
+        names.add(job['name'])
+        if job.get('type') not in JOB_TYPES:
+            raise ValueError(f'{job["name"]}: type must be one of {", ".join(JOB_TYPES)}')
+        if 'output' not in job:
+            raise ValueError(f'{job["name"]}: output is required')
+        if job['type'] in ('stories', 'analytics') and 'input' not in job:
+            raise ValueError(f'{job["name"]}: input is required for {job["type"]} jobs')
+        if job['type'] == 'analytics':
+            from chatnil_docs.analytics import GROUP_LABELS
+            if job.setdefault('by', 'sport') not in GROUP_LABELS:
+                raise ValueError(f'{job["name"]}: by must be one of {", ".join(sorted(GROUP_LABELS))}')
+        for key in ('input', 'output', 'content_store'):
+            if key in job:
+                job[key] = os.path.join(base_dir, job[key])
+        jobs.append(job)
+    return jobs
+
+def preload_shared(jobs):
+    """Load everything jobs need once, in the parent, so forked workers start warm"""
+    overview = load_script('generate-partner-overview')
+    load_script('add-customer-stories')
+    preload_template()
+    overview.default_cache.warm(
+        (name, builder) for name, builder in overview.SECTIONS if name in overview.STATIC_SECTIONS
+    )
+    if any(job['type'] == 'analytics' for job in jobs):
+        from chatnil_docs import analytics  # noqa: F401 (imports numpy)
+    # Park the preloaded objects in the permanent generation: collections in the workers then
+    # never write to their pages, so the pages stay shared with the parent
+    gc.freeze()
+
+def _pool_context():
+    """fork where the platform has it, so workers inherit the preloaded parent"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+def _execute(job):
+    """Run one job in the current process"""
+    overview = load_script('generate-partner-overview')
+    stories = load_script('add-customer-stories')
+    fields = job['fields']
+    store = story_store = None
+    if job.get('content_store') and job['type'] != 'analytics':
+        from chatnil_docs.content_store import open_sections
+        tenant = job.get('tenant', job['name'])
+        store = open_sections(job['content_store'], 'overview', job.get('audience'), tenant)
+        story_store = open_sections(job['content_store'], 'stories', job.get('audience'), tenant)
+
+    if job['type'] == 'overview':
+        doc = overview.build_document(fields, sections=job.get('sections'), store=store)
+        if job.get('stories'):
+            stories.add_customer_stories(doc, fields, store=story_store)
+        with span('save', 'section'):
+            os.makedirs(os.path.dirname(job['output']) or '.', exist_ok=True)
+            doc.save(job['output'])
+            annotate(bytes=os.path.getsize(job['output']))
+    elif job['type'] == 'stories':
+        stories.update_document(job['input'], job['output'], fields,
+                                before_heading=job.get('before_heading'),
+                                before_bookmark=job.get('before_bookmark'), sections=job.get('sections'),
+                                store=story_store)
+    else:
+        from chatnil_docs import analytics
+        columns = analytics.load_columns(job['input'])
+        report = analytics.aggregate(columns, by=job['by'], outlier_limit=job.get('outliers', 50))
+        doc = analytics.add_analytics_report(blank_document(), columns, report,
+                                             title=job.get('title', analytics.DEFAULT_TITLE))
+        with span('save', 'section'):
+            os.makedirs(os.path.dirname(job['output']) or '.', exist_ok=True)
+            brand(doc).save(job['output'])
+            annotate(bytes=os.path.getsize(job['output']))
+    return job['output']
+
+def run_job(job, trace=False):
+    """Run one job and return its summary; never raises, so one bad job cannot sink the batch
+
+    With trace, the summary carries the job's spans under 'spans'. A failed job's summary also
+    carries what the generator printed before it failed, under 'log'.
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    summary = {'name': job['name'], 'type': job['type'], 'output': job.get('output')}
+    tracer = Tracer(job=job['name'], tenant=job.get('tenant', job['name']))
+    try:
+        with contextlib.redirect_stdout(log), tracer.activate(), span('job', 'job', type=job['type']):
+            _execute(job)
+        summary['status'] = 'ok'
+        summary['sha256'] = file_sha256(job['output'])
+    except (Exception, SystemExit) as e:  # SystemExit: a generator bailing out must not end the batch
+        summary['status'] = 'failed'
+        summary['error'] = f'{type(e).__name__}: {e}'
+        summary['traceback'] = traceback.format_exc()
+        summary['log'] = log.getvalue()
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    if trace:
+        summary['spans'] = tracer.spans
+    return summary
+
+def _crashed(job, started, error):
+    """Summary for a job whose worker process died under it"""
+    return {
+        'name': job['name'], 'type': job['type'], 'output': job.get('output'), 'status': 'failed',
+        'error': f'{type(error).__name__}: worker died while the job was running (killed or out of memory)',
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+def run_jobs(jobs, workers=1, trace=False, preload=True, on_start=None):
+    """Run jobs across worker processes, yielding summaries as they finish
+
+    on_start(job), if given, is called as each job is handed to a worker. At most `workers` jobs
+    are in flight. If a worker dies (OOM kill, segfault), the pool is rebuilt; the jobs that were
+    in flight are rerun one at a time, so only the job that kills its worker alone fails.
+    """
+    if preload and jobs:
+        preload_shared(jobs)
+    if workers <= 1:
+        for job in jobs:
+            if on_start:
+                on_start(job)
+            yield run_job(job, trace)
+        return
+    pending = deque(jobs)
+    isolated = deque()  # in flight when a worker died: rerun alone to find the culprit
+    while pending or isolated:
+        crashed = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            running = {}  # future -> (job, start time, ran alone)
+            while running or ((pending or isolated) and not crashed):
+                while not crashed and (isolated or pending):
+                    queue = isolated or pending
+                    if running and (isolated or len(running) >= workers):
+                        break
+                    job = queue.popleft()
+                    try:
+                        future = pool.submit(run_job, job, trace)
+                    except BrokenProcessPool as e:
+                        queue.appendleft(job)
+                        crashed.append((None, 0.0, e))
+                        break
+                    if on_start:
+                        on_start(job)
+                    running[future] = (job, time.perf_counter(), queue is isolated)
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, started, alone = running.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool as e:
+                        # Every other job in flight fails the same way; drain them before rebuilding
+                        crashed.append((job, started, e) if not alone else (None, 0.0, e))
+                        if alone:
+                            yield _crashed(job, started, e)
+        suspects = [entry for entry in crashed if entry[0] is not None]
+        if len(suspects) == 1:
+            yield _crashed(*suspects[0])
+        else:
+            isolated.extend(job for job, _, _ in suspects)
+
+# Last lines of a failed job's output shown under its row in the summary (all of it goes to --summary)
+LOG_TAIL_LINES = 10
+
+def print_summary(summaries, elapsed):
+    """Per-job timing and failure table"""
+    width = max((len(s['name']) for s in summaries), default=4)
+    for s in sorted(summaries, key=lambda s: s['name']):
+        detail = s.get('error') or s['output']
+        print(f'{s["name"]:<{width}}  {s["status"]:<7}  {s["seconds"]:>8.2f}s  {detail}')
+        for line in s.get('log', '').splitlines()[-LOG_TAIL_LINES:]:
+            print(f'{"":<{width}}  | {line}')
+    counts = {}
+    for s in summaries:
+        counts[s['status']] = counts.get(s['status'], 0) + 1
+    breakdown = ', '.join(f'{count} {status}' for status, count in sorted(counts.items()))
+    print(f'{len(summaries)} jobs ({breakdown}), {elapsed:.2f}s wall time')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a manifest of document generation jobs')
+    parser.add_argument('manifest', help='Job manifest (.toml or .json)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of worker processes')
+    parser.add_argument('--summary', metavar='PATH', help='Also write the per-job summary as JSON')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write every job\'s spans as one Chrome trace (.json) or JSONL (.jsonl)')
+    parser.add_argument('--checkpoint', metavar='PATH',
+                        help='Record finished jobs in PATH and skip them when the run is restarted')
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help='With --checkpoint, stop retrying a job after this many failures (default: 3)')
+    parser.add_argument('--no-preload', action='store_true',
+                        help='Let each worker import and parse everything itself instead of forking a warm parent')
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)
+    by_name = {job['name']: job for job in jobs}
+    summaries = []
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint, args.max_attempts)
+        jobs, finished, given_up = checkpoint.partition(jobs)
+        for job in finished:
+            summaries.append({'name': job['name'], 'type': job['type'], 'output': job['output'],
+                              'status': 'done', 'seconds': 0.0})
+        for job in given_up:
+            entry = checkpoint.jobs[job['name']]
+            summaries.append({'name': job['name'], 'type': job['type'], 'output': job['output'],
+                              'status': 'gave-up', 'seconds': 0.0,
+                              'error': f'{entry["attempts"]} failed attempts; last: {entry["error"]}'})
+        print(f'Checkpoint {args.checkpoint}: {len(finished)} done, {len(given_up)} over the retry cap')
+
+    print(f'Running {len(jobs)} jobs with {args.jobs} worker(s)...')
+    start = time.perf_counter()
+    spans = []
+    results = run_jobs(jobs, args.jobs, trace=bool(args.trace), preload=not args.no_preload,
+                       on_start=checkpoint.start if checkpoint else None)
+    for index, summary in enumerate(results, start=1):
+        spans.extend(summary.pop('spans', []))
+        summaries.append(summary)
+        if checkpoint:
+            checkpoint.record(by_name[summary['name']], summary)
+        print(f'[{index}/{len(jobs)}] {summary["name"]}: {summary["status"]} ({summary["seconds"]:.2f}s)')
+    elapsed = time.perf_counter() - start
+
+    print_summary(summaries, elapsed)
+    if args.trace:
+        write_spans(args.trace, spans)
+        print(f'Trace saved to: {args.trace} ({len(spans)} spans)')
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump({'elapsed_seconds': round(elapsed, 3), 'jobs': summaries}, f, indent=2)
+    return 1 if any(s['status'] in ('failed', 'gave-up') for s in summaries) else 0
@@ -0,0 +1,145 @@
+"""
+Native DrawingML charts (c:chartSpace) for score distributions
+Charts are written as chart parts with literal cached values straight from arrays of scores,
+so there is no matplotlib, no raster image and no embedded workbook. Word and LibreOffice
+render them as vector charts; a chart part is typically 2-4 KB.
+"""
+
+from xml.sax.saxutils import escape
+
+from docx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Inches
+
+from chatnil_docs.deals import DIMENSIONS, STATUS_GREEN, STATUS_YELLOW
+from chatnil_docs.theme import PALETTE, SLOTS
+
+CHART_URI = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+
+# Status colors for histogram bars; brand orange for everything else
+STATUS_COLORS = {'green': '22C55E', 'yellow': 'EAB308', 'red': 'EF4444'}
+BRAND_COLOR = PALETTE['primary']
+
+# Palette colors are written as theme colors, so a brand refresh (chatnil_docs.theme) reaches charts
+SCHEME_COLORS = {color: SLOTS[role] for role, color in PALETTE.items()}
+
+def histogram(scores, bins=10, low=0.0, high=100.0):
+    """Count scores into equal-width bins over [low, high]; the last bin includes high"""
+    width = (high - low) / bins
+    counts = [0] * bins
+    for score in scores:
+        if low <= score <= high:
+            counts[min(int((score - low) // width), bins - 1)] += 1
+    return counts
+
+def _solid_fill(color):
+    scheme_color = SCHEME_COLORS.get(color)
+    fill = f'<a:schemeClr val="{scheme_color}"/>' if scheme_color else f'<a:srgbClr val="{color}"/>'
+    return f'<c:spPr><a:solidFill>{fill}</a:solidFill></c:spPr>'
+
+def _str_lit(values):
+    points = ''.join(f'<c:pt idx="{i}"><c:v>{escape(str(v))}</c:v></c:pt>' for i, v in enumerate(values))
+    return f'<c:strLit><c:ptCount val="{len(values)}"/>{points}</c:strLit>'
+
+def _num_lit(values, format_code='General'):
+    points = ''.join(f'<c:pt idx="{i}"><c:v>{v:g}</c:v></c:pt>' for i, v in enumerate(values))
+    return (f'<c:numLit><c:formatCode>{format_code}</c:formatCode>'
+            f'<c:ptCount val="{len(values)}"/>{points}</c:numLit>')
+
+def bar_chart_xml(categories, series, title=None, point_colors=None, value_max=None):
+    """Return c:chartSpace XML bytes for a clustered column chart
+
+    series is a list of (name, values, color); point_colors optionally colors the points of a
+    single-series chart individually (e.g. by compliance status).
+    """
+    ser_xml = []
+    for order, (name, values, color) in enumerate(series):
+        points = ''.join(
+            f'<c:dPt><c:idx val="{i}"/><c:invertIfNegative val="0"/><c:bubble3D val="0"/>'
+            f'{_solid_fill(point_color)}</c:dPt>'
+            for i, point_color in enumerate(point_colors or [])
+        ) if order == 0 else ''
+        ser_xml.append(
+            f'<c:ser><c:idx val="{order}"/><c:order val="{order}"/>'
+            f'<c:tx><c:v>{escape(name)}</c:v></c:tx>{_solid_fill(color)}'
+            f'<c:invertIfNegative val="0"/>{points}'
+            f'<c:cat>{_str_lit(categories)}</c:cat><c:val>{_num_lit(values)}</c:val></c:ser>'
+        )
+
+    title_xml = (
+        f'<c:title><c:tx><c:rich><a:bodyPr/><a:p><a:pPr><a:defRPr sz="1200" b="1"/></a:pPr>'
+        f'<a:r><a:rPr lang="en-US" sz="1200" b="1"/><a:t>{escape(title)}</a:t></a:r></a:p></c:rich></c:tx>'
+        f'<c:overlay val="0"/></c:title><c:autoTitleDeleted val="0"/>'
+        if title else '<c:autoTitleDeleted val="1"/>'
+    )
+    legend_xml = '<c:legend><c:legendPos val="b"/><c:overlay val="0"/></c:legend>' if len(series) > 1 else ''
+    scaling_max = f'<c:max val="{value_max:g}"/>' if value_max is not None else ''
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<c:chartSpace {nsdecls("c", "a", "r")}><c:roundedCorners val="0"/><c:chart>{title_xml}'
+        '<c:plotArea><c:layout/><c:barChart><c:barDir val="col"/><c:grouping val="clustered"/>'
+        f'<c:varyColors val="0"/>{"".join(ser_xml)}<c:gapWidth val="60"/>'
+        '<c:axId val="100"/><c:axId val="200"/></c:barChart>'
+        '<c:catAx><c:axId val="100"/><c:scaling><c:orientation val="minMax"/></c:scaling>'
+        '<c:delete val="0"/><c:axPos val="b"/><c:numFmt formatCode="General" sourceLinked="0"/>'
+        '<c:tickLblPos val="nextTo"/><c:crossAx val="200"/><c:crosses val="autoZero"/>'
+        '<c:auto val="1"/><c:lblAlgn val="ctr"/><c:lblOffset val="100"/></c:catAx>'
+        f'<c:valAx><c:axId val="200"/><c:scaling><c:orientation val="minMax"/>{scaling_max}'
+        '<c:min val="0"/></c:scaling><c:delete val="0"/><c:axPos val="l"/><c:majorGridlines/>'
+        '<c:numFmt formatCode="General" sourceLinked="0"/><c:tickLblPos val="nextTo"/>'
+        '<c:crossAx val="100"/><c:crosses val="autoZero"/><c:crossBetween val="between"/></c:valAx>'
+        f'</c:plotArea>{legend_xml}<c:plotVisOnly val="1"/></c:chart></c:chartSpace>'
+    ).encode('utf-8')
+
+def add_chart(doc, chart_xml, width=Inches(6), height=Inches(3)):
+    """Add a chart part to the package and an inline chart paragraph to the body"""
+    document_part = doc.part
+    partname = document_part.package.next_partname('/word/charts/chart%d.xml')
+    chart_part = Part(PackURI(partname), CT.DML_CHART, chart_xml, document_part.package)
+    r_id = document_part.relate_to(chart_part, RT.CHART)
+    shape_id = document_part.next_id
+
+    drawing = parse_xml(
+        f'<w:drawing {nsdecls("w", "wp", "a", "c", "r")}>'
+        f'<wp:inline distT="0" distB="0" distL="0" distR="0">'
+        f'<wp:extent cx="{int(width)}" cy="{int(height)}"/><wp:effectExtent l="0" t="0" r="0" b="0"/>'
+        f'<wp:docPr id="{shape_id}" name="Chart {shape_id}"/><wp:cNvGraphicFramePr/>'
+        f'<a:graphic><a:graphicData uri="{CHART_URI}"><c:chart r:id="{r_id}"/></a:graphicData></a:graphic>'
+        f'</wp:inline></w:drawing>'
+    )
+    p = doc.add_paragraph()
+    p.add_run()._r.append(drawing)
+    return p
+
+def status_color(score):
+    """Bar color for a score bucket, by its GREEN/YELLOW/RED threshold"""
+    if score >= STATUS_GREEN:
+        return STATUS_COLORS['green']
+    if score >= STATUS_YELLOW:
+        return STATUS_COLORS['yellow']
+    return STATUS_COLORS['red']
+
+def add_score_histogram(doc, scores, title='Combined Score Distribution', bins=10):
+    """Histogram of 0-100 scores, bars colored by compliance status"""
+    width = 100 / bins
+    lows = [i * width for i in range(bins)]
+    labels = [f'{low:g}-{low + width - 1:g}' if i < bins - 1 else f'{low:g}-100' for i, low in enumerate(lows)]
+    counts = histogram(scores, bins)
+    xml = bar_chart_xml(labels, [('Deals', counts, BRAND_COLOR)], title,
+                        point_colors=[status_color(low) for low in lows])
+    return add_chart(doc, xml)
+
+def add_dimension_chart(doc, series, title='Mean Dimension Scores'):
+    """Bar chart of the six dimension scores; series is a list of (name, six values)"""
+    palette = [BRAND_COLOR, PALETTE['text'], PALETTE['muted'], 'FDBA74', '9CA3AF', 'FED7AA']
+    labels = [label for _, label, _ in DIMENSIONS]
+    xml = bar_chart_xml(
+        labels,
+        [(name, list(values), palette[i % len(palette)]) for i, (name, values) in enumerate(series)],
+        title, value_max=100,
+    )
+    return add_chart(doc, xml)
@@ -0,0 +1,110 @@
+"""
+Checkpoints for resumable batch runs
+Each job is recorded as running when it starts, which counts the attempt, and again with its
+outcome when it finishes: a fingerprint of its spec, the attempt count and the SHA-256 of its
+output. The file is rewritten atomically (temp file, fsync, rename) after every update, so a
+run killed at any point leaves a valid checkpoint. On restart, jobs whose spec is unchanged and
+whose output still hashes the same are skipped; failed jobs are retried until they reach
+max_attempts. A job still marked running never finished (its worker or the whole run was
+killed, e.g. out of memory) and counts as a failed attempt, so a job that keeps taking the
+run down is eventually given up on.
+"""
+
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+
+from chatnil_docs.files import file_sha256, write_atomic
+
+def job_fingerprint(job):
+    """Hash of a job's spec; editing the job in the manifest makes it run again"""
+    return hashlib.sha256(json.dumps(job, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class Checkpoint:
+    """Job outcomes keyed by job name, persisted after every update"""
+
+    def __init__(self, path, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.jobs = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.jobs = json.load(f).get('jobs', {})
+        for entry in self.jobs.values():
+            if entry['status'] == 'running':
+                entry['status'] = 'failed'
+                entry['error'] = 'Did not finish: the run or its worker was killed while the job was running'
+
+    def is_done(self, job):
+        """True if the job already succeeded with the same spec and its output is intact"""
+        entry = self.jobs.get(job['name'])
+        return (
+            entry is not None and entry['status'] == 'ok'
+            and entry['fingerprint'] == job_fingerprint(job)
+            and entry.get('sha256') == file_sha256(job['output'])
+        )
+
+    def gave_up(self, job):
+        """True if the job failed max_attempts times with its current spec"""
+        entry = self.jobs.get(job['name'])
+        return (
+            entry is not None and entry['status'] == 'failed'
+            and entry['fingerprint'] == job_fingerprint(job)
+            and entry['attempts'] >= self.max_attempts
+        )
+
+    def partition(self, jobs):
+        """Split jobs into (to run, finished, given up)"""
+        to_run, finished, given_up = [], [], []
+        for job in jobs:
+            if self.is_done(job):
+                finished.append(job)
+            elif self.gave_up(job):
+                given_up.append(job)
+            else:
+                to_run.append(job)
+        return to_run, finished, given_up
+
+    def _attempts(self, job, fingerprint):
+        """Attempts so far at the job's current spec"""
+        previous = self.jobs.get(job['name'], {})
+        return previous.get('attempts', 0) if previous.get('fingerprint') == fingerprint else 0
+
+    def start(self, job):
+        """Mark a job as running, counting the attempt, and rewrite the checkpoint"""
+        fingerprint = job_fingerprint(job)
+        self.jobs[job['name']] = {
+            'status': 'running',
+            'fingerprint': fingerprint,
+            'output': job['output'],
+            'attempts': self._attempts(job, fingerprint) + 1,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+        }
+        self.save()
+
+    def record(self, job, summary):
+        """Store a job's outcome and rewrite the checkpoint"""
+        fingerprint = job_fingerprint(job)
+        previous = self.jobs.get(job['name'], {})
+        attempts = self._attempts(job, fingerprint)
+        if not (previous.get('status') == 'running' and previous.get('fingerprint') == fingerprint):
+            attempts += 1  # not marked by start()
+        entry = {
+            'status': summary['status'],
+            'fingerprint': fingerprint,
+            'output': job['output'],
+            'attempts': attempts,
+            'seconds': summary['seconds'],
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+        }
+        if summary['status'] == 'ok':
+            entry['sha256'] = summary.get('sha256') or file_sha256(job['output'])
+        else:
+            entry['error'] = summary.get('error')
+        self.jobs[job['name']] = entry
+        self.save()
+
+    def save(self):
+        data = json.dumps({'version': 1, 'jobs': self.jobs}, indent=2, sort_keys=True)
+        write_atomic(self.path, data.encode('utf-8'))
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Behavior checks for the tooling the goldens do not cover
+The goldens pin the generators' XML; these assert what the batch runner, the merger and the
+FMV engine must do: one failing job (even one that calls sys.exit) cannot sink a batch, merged
+drawings get document-unique ids and copied parts get fresh partnames, and the FMV engine's
+flags track the seeded dataset's known inflated deals.
+
+Usage:
+    python -m chatnil_docs.checks                 # run every check
+    python -m chatnil_docs.checks merge-ids fmv   # run selected checks
+"""
+
+from unittest import mock
+import argparse
+import io
+import json
+import os
+import struct
+import sys
+import tempfile
+import traceback
+import zlib
+
+from docx import Document
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+AF_CHUNK = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/aFChunk'
+
+# Seeded dataset the FMV engine is held to, and the floor on its precision and recall there
+FMV_DATASET = {'athletes': 650, 'schools': 1, 'deals_per_athlete': 2.5, 'seed': 0, 'as_of': '2026-01-01'}
+FMV_MIN_PRECISION = 0.80
+FMV_MIN_RECALL = 0.80
+
+def _png(rgb):
+    """A 1x1 PNG; distinct colours give distinct image parts"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b'\x00' + bytes(rgb))) + chunk(b'IEND', b''))
+
+def check_batch_isolation():
+    """A raising job and a sys.exit() job fail alone; the jobs around them still succeed"""
+    from chatnil_docs import batch
+
+    real_execute = batch._execute
+
+    def execute(job):
+        if job['name'] == 'exits':
+            sys.exit('generator gave up')
+        return real_execute(job)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'broken.jsonl'), 'w', encoding='utf-8') as f:
+            f.write('{not json\n')
+        manifest = os.path.join(tmp, 'manifest.json')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            json.dump({'jobs': [
+                {'name': 'first', 'type': 'overview', 'output': 'out/first.docx', 'sections': ['scoring']},
+                {'name': 'missing', 'type': 'analytics', 'input': 'nope.jsonl', 'output': 'out/missing.docx'},
+                {'name': 'broken', 'type': 'analytics', 'input': 'broken.jsonl', 'output': 'out/broken.docx'},
+                {'name': 'exits', 'type': 'overview', 'output': 'out/exits.docx'},
+                {'name': 'last', 'type': 'overview', 'output': 'out/last.docx', 'sections': ['scoring']},
+            ]}, f)
+        jobs = batch.load_manifest(manifest)
+        with mock.patch.object(batch, '_execute', execute):
+            summaries = {s['name']: s for s in batch.run_jobs(jobs, workers=1, preload=False)}
+
+        assert sorted(summaries) == sorted(job['name'] for job in jobs), f'missing summaries: {sorted(summaries)}'
+        for name in ('first', 'last'):
+            summary = summaries[name]
+            assert summary['status'] == 'ok', f'{name}: {summary.get("error")}'
+            assert os.path.exists(summary['output']) and summary['sha256'], f'{name}: no output recorded'
+        for name, error in (('missing', 'FileNotFoundError'), ('broken', 'JSONDecodeError'), ('exits', 'SystemExit')):
+            summary = summaries[name]
+            assert summary['status'] == 'failed', f'{name}: expected a failure, got {summary["status"]}'
+            assert summary['error'].startswith(error), f'{name}: unexpected error {summary["error"]}'
+            assert not os.path.exists(summary['output']), f'{name}: a failed job left an output behind'
+    return f'{len(summaries)} jobs, {sum(s["status"] == "failed" for s in summaries.values())} failed alone'
+
+def check_merge_ids():
+    """Drawings merged into a document get docPr ids unused by it and by each other"""
+    from chatnil_docs.merge import merge_into
+
+    target = Document()
+    target.add_paragraph().add_run().add_picture(io.BytesIO(_png((1, 2, 3))))
+    source = Document()
+    run = source.add_paragraph().add_run()
+    run.add_picture(io.BytesIO(_png((4, 5, 6))))
+    run.add_picture(io.BytesIO(_png((7, 8, 9))))
+    merge_into(target, source)
+    merge_into(target, source)  # merging the same content twice must not reuse ids either
+
+    ids = [el.get('id') for el in target.element.iter(qn('wp:docPr'))]
+    assert len(ids) == 5, f'expected 5 drawings, found {len(ids)}'
+    assert len(set(ids)) == len(ids), f'duplicate docPr ids: {ids}'
+    return f'docPr ids {", ".join(ids)}'
+
+def check_merge_partnames():
+    """Copied parts get fresh partnames, including parts named without a number; identical ones are reused"""
+    from chatnil_docs.merge import _partname_template, merge_into
+
+    for partname, template in (('/word/media/image3.png', '/word/media/image%d.png'),
+                               ('/word/logo.xml', '/word/logo%d.xml'),
+                               ('/word/100%.bin', '/word/100%%%d.bin'),
+                               ('/word/notes', '/word/notes%d')):
+        assert _partname_template(partname) == template, \
+            f'{partname}: template {_partname_template(partname)!r}, expected {template!r}'
+
+    def with_logo(blob):
+        source = Document()
+        part = Part(PackURI('/word/logo.xml'), 'application/xml', blob, source.part.package)
+        r_id = source.part.relate_to(part, AF_CHUNK)
+        source.element.body.sectPr.addprevious(parse_xml(f'<w:altChunk {nsdecls("w", "r")} r:id="{r_id}"/>'))
+        return source
+
+    target = with_logo(b'<logo>target</logo>')
+    merge_into(target, with_logo(b'<logo>first</logo>'))
+    merge_into(target, with_logo(b'<logo>second</logo>'))
+    merge_into(target, with_logo(b'<logo>first</logo>'))  # same content: the copied part is reused
+
+    buffer = io.BytesIO()
+    target.save(buffer)
+    parts = {str(p.partname): p.blob for p in Document(buffer).part.package.iter_parts() if 'logo' in p.partname}
+    assert sorted(parts) == ['/word/logo.xml', '/word/logo1.xml', '/word/logo2.xml'], \
+        f'unexpected logo partnames: {sorted(parts)}'
+    assert len(set(parts.values())) == 3, 'a merged part overwrote another'
+    return ', '.join(sorted(parts))
+
+def check_fmv():
+    """On the seeded dataset the engine flags about as many deals as are inflated, and mostly those"""
+    from chatnil_docs import fmv, synthetic
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'deals.npz')
+        synthetic.write_npz(path, {**FMV_DATASET, 'chunk_size': synthetic.CHUNK_SIZE})
+        columns = synthetic.read_npz(path)
+    result = fmv.audit(fmv.index_from_columns(columns), columns)
+    truth = fmv.ground_truth(result, columns['inflated'])
+
+    assert not result['no_reach'].any(), f'{int(result["no_reach"].sum())} seeded deals have no reach'
+    assert abs(truth['flag_rate'] - truth['inflated_rate']) <= fmv.FLAG_RATE_TOLERANCE, \
+        f'flag rate {truth["flag_rate"]:.3f} vs inflated rate {truth["inflated_rate"]:.3f}'
+    assert truth['precision'] >= FMV_MIN_PRECISION, f'precision {truth["precision"]:.2f}'
+    assert truth['recall'] >= FMV_MIN_RECALL, f'recall {truth["recall"]:.2f}'
+    return (f'{100 * truth["flag_rate"]:.1f}% flagged, {100 * truth["inflated_rate"]:.1f}% inflated, '
+            f'precision {100 * truth["precision"]:.0f}%, recall {100 * truth["recall"]:.0f}%')
+
+CHECKS = {
+    'batch-isolation': check_batch_isolation,
+    'merge-ids': check_merge_ids,
+    'merge-partnames': check_merge_partnames,
+    'fmv': check_fmv,
+}
+
+def run_check(name):
+    """Run one check and return (passed, detail)"""
+    try:
+        return True, CHECKS[name]()
+    except AssertionError as e:
+        return False, str(e)
+    except Exception:
+        return False, traceback.format_exc().rstrip()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run behavior checks for batch, merge and FMV')
+    parser.add_argument('checks', nargs='*', help='Checks to run (default: all)')
+    args = parser.parse_args(argv)
+
+    names = args.checks or list(CHECKS)
+    unknown = [n for n in names if n not in CHECKS]
+    if unknown:
+        parser.error(f'Unknown checks: {", ".join(unknown)} (available: {", ".join(CHECKS)})')
+
+    failures = 0
+    for name in names:
+        passed, detail = run_check(name)
+        failures += not passed
+        print(f'{"ok" if passed else "FAILED"} {name}: {detail}')
+    print(f'{len(names)} checks run, {failures} failed')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
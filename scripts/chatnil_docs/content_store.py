@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed content repository for sections, bullet lists, tables and persona stories
+Fragments are versioned, tagged by audience (hs, college, parent, compliance) and optionally
+scoped to a tenant. Each version caches its pre-rendered WordprocessingML, so assembling a
+document is an indexed query plus XML splicing rather than re-running the Python builders.
+The generators also build from a store (--content-store, see StoredSections): their sections
+come from the store where it has them, for the requested audience and tenant.
+
+Usage:
+    python -m chatnil_docs.content_store content.db import
+    python -m chatnil_docs.content_store content.db assemble out.docx --audience compliance --tenant acu
+    python generate-partner-overview.py --content-store content.db --audience parent --tenant acu
+"""
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from xml.sax.saxutils import escape
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+
+from chatnil_docs import fragments, load_script
+from chatnil_docs.anchors import section_xml
+from chatnil_docs.mailmerge import PLACEHOLDER_RE, placeholders
+from chatnil_docs.theme import brand
+
+AUDIENCES = ('hs', 'college', 'parent', 'compliance')
+KINDS = ('section', 'bullets', 'table', 'story')
+
+# Audiences for the sections seeded from the generators; anything missing goes to everyone
+SECTION_AUDIENCES = {
+    'overview/high_school': ('hs', 'parent'),
+    'overview/college_athlete': ('college', 'compliance'),
+    'overview/parent': ('parent',),
+    'overview/compliance_officer': ('compliance',),
+    'overview/scoring': ('college', 'compliance'),
+    'stories/jasmine': ('hs',),
+    'stories/darius': ('college',),
+    'stories/michelle': ('parent',),
+    'stories/angela': ('compliance',),
+}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS fragments (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    tenant TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    page_break_before INTEGER NOT NULL DEFAULT 0,
+    content TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    rendered_xml BLOB NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (key, tenant, version)
+);
+CREATE TABLE IF NOT EXISTS fragment_audiences (
+    audience TEXT NOT NULL,
+    fragment_id INTEGER NOT NULL REFERENCES fragments(id) ON DELETE CASCADE,
+    PRIMARY KEY (audience, fragment_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fragments_tenant_key ON fragments (tenant, key, version DESC);
+'''
+
+def open_store(path):
+    """Open (and create if needed) a content store"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+def render_blocks(doc, blocks):
+    """Render authored JSON blocks with the overview's styling helpers"""
+    overview = load_script('generate-partner-overview')
+    for block in blocks:
+        kind = block['type']
+        if kind == 'heading':
+            overview.create_heading(doc, block['text'], block.get('level', 1))
+        elif kind == 'paragraph':
+            doc.add_paragraph(block['text'])
+        elif kind == 'bullets':
+            overview.add_bullet_list(doc, block['items'], block.get('bold_first_part', False))
+        elif kind == 'table':
+            overview.add_table(doc, block['headers'], block['rows'], block.get('first_col_bold', False))
+        else:
+            raise ValueError(f'Unknown block type: {kind}')
+
+def put_fragment(conn, key, kind, content, audiences=AUDIENCES, tenant='', position=0,
+                 page_break_before=False, render=None, source_hash=None):
+    """Store a fragment, adding a new version only when its source changed; returns (id, version)
+
+    render() returns the fragment's body XML and is only called for a new version; by default
+    content['blocks'] is rendered with render_blocks().
+    """
+    if kind not in KINDS:
+        raise ValueError(f'Unknown fragment kind: {kind}')
+    unknown = set(audiences) - set(AUDIENCES)
+    if unknown:
+        raise ValueError(f'Unknown audiences: {", ".join(sorted(unknown))}')
+
+    content_json = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    source_hash = source_hash or hashlib.sha256(content_json.encode('utf-8')).hexdigest()
+    latest = conn.execute(
+        'SELECT id, version, source_hash FROM fragments WHERE key = ? AND tenant = ? '
+        'ORDER BY version DESC LIMIT 1', (key, tenant)
+    ).fetchone()
+    if latest and latest['source_hash'] == source_hash:
+        return latest['id'], latest['version']
+
+    rendered_xml = render() if render else section_xml(render_blocks, content['blocks'])
+    if b' r:id=' in rendered_xml or b' r:embed=' in rendered_xml:
+        raise ValueError(f'Fragment {key} references package relationships and cannot be cached')
+
+    version = latest['version'] + 1 if latest else 1
+    with conn:
+        cursor = conn.execute(
+            'INSERT INTO fragments (key, tenant, version, kind, position, page_break_before, content, '
+            'source_hash, rendered_xml) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (key, tenant, version, kind, position, int(page_break_before), content_json, source_hash, rendered_xml),
+        )
+        conn.executemany(
+            'INSERT INTO fragment_audiences (audience, fragment_id) VALUES (?, ?)',
+            [(audience, cursor.lastrowid) for audience in audiences],
+        )
+    return cursor.lastrowid, version
+
+def import_generators(conn):
+    """Seed (or refresh) the store from the generators' section builders"""
+    overview = load_script('generate-partner-overview')
+    stories = load_script('add-customer-stories')
+    sources = [
+        ('overview', 'section', overview.SECTIONS, placeholders(overview.DEFAULT_FIELDS), 0),
+        ('stories', 'story', stories.STORIES, placeholders(stories.DEFAULT_FIELDS), 1000),
+    ]
+    imported = []
+    for prefix, kind, sections, fields, base_position in sources:
+        for index, (name, builder) in enumerate(sections):
+            key = f'{prefix}/{name}'
+            # Overview sections are separated by page breaks; stories handle their own after the first
+            page_break_before = index > 0 if prefix == 'overview' else index > 1
+            put_fragment(
+                conn, key, kind, {'builder': f'{builder.__module__}.{builder.__name__}'},
+                audiences=SECTION_AUDIENCES.get(key, AUDIENCES), position=base_position + index,
+                page_break_before=page_break_before, source_hash=fragments.source_hash(builder),
+                render=lambda builder=builder, fields=fields: section_xml(builder, fields),
+            )
+            imported.append(key)
+    return imported
+
+def query_fragments(conn, audience=None, tenant='', keys=None):
+    """Latest version of each fragment for a tenant (tenant rows override shared ones), in order"""
+    params = [tenant]
+    where = ["f.tenant IN ('', ?)"]
+    if keys:
+        where.append(f'f.key IN ({", ".join("?" * len(keys))})')
+        params.extend(keys)
+    outer = ['rank = 1']
+    if audience:
+        # Filter after ranking so a newer version that dropped the audience is not masked
+        outer.append('id IN (SELECT fragment_id FROM fragment_audiences WHERE audience = ?)')
+        params.append(audience)
+    return conn.execute(f'''
+        SELECT * FROM (
+            SELECT f.*, ROW_NUMBER() OVER (
+                PARTITION BY f.key ORDER BY f.tenant = '', f.version DESC
+            ) AS rank
+            FROM fragments f WHERE {" AND ".join(where)}
+        ) WHERE {" AND ".join(outer)} ORDER BY position, key
+    ''', params).fetchall()
+
+def _encode_fields(values):
+    return {name: escape(str(value)).encode('utf-8') for name, value in values.items()}
+
+def _append_fragment(doc, xml, encoded):
+    """Append stored fragment XML to the end of doc's body with its {{field}} placeholders filled"""
+    missing = sorted({m.group(1).decode('ascii') for m in PLACEHOLDER_RE.finditer(xml)} - set(encoded))
+    if missing:
+        raise KeyError(f'Missing merge fields: {", ".join(missing)}')
+    xml = PLACEHOLDER_RE.sub(lambda m: encoded[m.group(1).decode('ascii')], xml)
+    wrapper = parse_xml(f'<w:body {nsdecls("w")}>'.encode('utf-8') + xml + b'</w:body>')
+    sect_pr = doc.element.body.sectPr
+    for element in list(wrapper):
+        sect_pr.addprevious(element)
+
+def assemble(conn, audience=None, tenant='', keys=None, fields=None):
+    """Build a document from the cached fragment XML, filling in mail-merge fields"""
+    overview = load_script('generate-partner-overview')
+    stories = load_script('add-customer-stories')
+    encoded = _encode_fields({**overview.DEFAULT_FIELDS, **stories.DEFAULT_FIELDS, **(fields or {})})
+
+    doc = Document()
+    for index, row in enumerate(query_fragments(conn, audience, tenant, keys)):
+        if row['page_break_before'] and index:
+            overview.add_page_break(doc)
+        _append_fragment(doc, row['rendered_xml'], encoded)
+    return brand(doc)
+
+class StoredSections:
+    """One generator's sections (keys prefix/name) as a store holds them for an audience and tenant
+
+    A generator splices the sections stored for the audience instead of running their builders,
+    leaves out the sections stored only for other audiences, and builds the rest as usual.
+    """
+
+    def __init__(self, conn, prefix, audience=None, tenant=''):
+        def by_name(rows):
+            return {row['key'][len(prefix) + 1:]: row for row in rows if row['key'].startswith(f'{prefix}/')}
+        self.rows = by_name(query_fragments(conn, audience, tenant))
+        self.stored = set(by_name(query_fragments(conn, None, tenant)))
+
+    def __contains__(self, name):
+        return name in self.rows
+
+    def excludes(self, name):
+        """True if the store has the section, but not for this audience"""
+        return name in self.stored and name not in self.rows
+
+    def splice(self, doc, name, fields):
+        """Append the stored section to the end of doc's body, filling in mail-merge fields"""
+        _append_fragment(doc, self.rows[name]['rendered_xml'], _encode_fields(fields))
+
+def open_sections(path, prefix, audience=None, tenant=''):
+    """StoredSections for a generator from the store at path, which must exist"""
+    if audience and audience not in AUDIENCES:
+        raise ValueError(f'Unknown audience: {audience} (expected {", ".join(AUDIENCES)})')
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'No content store at {path} (create one with: content_store {path} import)')
+    return StoredSections(open_store(path), prefix, audience, tenant)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the SQLite content store')
+    parser.add_argument('database', help='Path to the content store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('import', help='Seed or refresh fragments from the generators')
+    put = commands.add_parser('put', help='Add an authored fragment from a JSON file')
+    put.add_argument('fragment', help='JSON: {"key", "kind", "blocks", "audiences", "tenant", "position"}')
+    build = commands.add_parser('assemble', help='Assemble a document from stored fragments')
+    build.add_argument('output', help='Output .docx path')
+    build.add_argument('--audience', choices=AUDIENCES)
+    build.add_argument('--tenant', default='')
+    build.add_argument('--key', action='append', dest='keys', help='Only include these keys')
+    args = parser.parse_args(argv)
+
+    conn = open_store(args.database)
+    if args.command == 'import':
+        keys = import_generators(conn)
+        print(f'Imported {len(keys)} fragments into {args.database}')
+    elif args.command == 'put':
+        with open(args.fragment, encoding='utf-8') as f:
+            spec = json.load(f)
+        fragment_id, version = put_fragment(
+            conn, spec['key'], spec.get('kind', 'section'), {'blocks': spec['blocks']},
+            audiences=spec.get('audiences', AUDIENCES), tenant=spec.get('tenant', ''),
+            position=spec.get('position', 0), page_break_before=spec.get('page_break_before', False),
+        )
+        print(f'Stored {spec["key"]} version {version} (id {fragment_id})')
+    else:
+        doc = assemble(conn, args.audience, args.tenant, args.keys)
+        doc.save(args.output)
+        print(f'Document saved to: {args.output}')
+
+if __name__ == '__main__':
+    main()
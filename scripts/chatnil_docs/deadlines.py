@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Disclosure deadline tracker for compliance officers
+Every deal's NCAA disclosure deadline (signing date plus 5 business days) is indexed in one
+sorted array keyed by (group, deadline), where a group is an institution or a team (school +
+sport). "Overdue" and "due in the next N days" are then two binary searches per group, so a
+conference-wide report is one vectorized searchsorted however many deals there are. Results
+are rendered as branded tables through add_table(), overdue and soonest first.
+
+Deals are treated as signed by the as-of date and not yet disclosed; overdue counts look back
+--lookback days.
+
+Usage:
+    python -m chatnil_docs.deadlines deals.npz deadlines.docx [--by school|team] [--as-of 2026-01-01]
+        [--days 14] [--school "Atlantic Coast University"]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from chatnil_docs import load_script
+from chatnil_docs.analytics import load_columns
+from chatnil_docs.template import blank_document
+from chatnil_docs.theme import brand
+
+DISCLOSURE_BUSINESS_DAYS = 5  # NCAA: disclose within 5 business days of signing
+WINDOWS = (1, 2, 5)  # "due today", "due in 2 days", "due in 5 days" columns, plus --days
+GROUP_LABELS = {'school': 'Institution', 'team': 'Team'}
+DEAL_HEADERS = ['Deal', 'Athlete', 'School', 'Sport', 'Signed', 'Deadline', 'Days Left', 'Compensation']
+
+def disclosure_deadlines(deal_dates, business_days=DISCLOSURE_BUSINESS_DAYS):
+    """Deadline per deal: signing date plus business_days business days (weekends skipped)"""
+    dates = np.asarray(deal_dates).astype('datetime64[D]')
+    return np.busday_offset(dates, business_days, roll='forward')
+
+def _encode(values):
+    """(sorted labels, code per value); one dict pass beats np.unique's string sort on big columns"""
+    seen = {}
+    values = np.asarray(values).astype(str).tolist()
+    codes = np.fromiter((seen.setdefault(value, len(seen)) for value in values), np.int64, len(values))
+    labels = sorted(seen)
+    remap = np.empty(len(labels), dtype=np.int64)
+    remap[[seen[label] for label in labels]] = np.arange(len(labels))
+    return np.array(labels), remap[codes]
+
+def group_codes(columns, by='school'):
+    """(group labels, group code per deal) for institutions or teams ('school / sport')"""
+    schools, school_code = _encode(columns['school'])
+    if by == 'school':
+        return schools, school_code
+    if by != 'team':
+        raise ValueError(f'Unknown grouping: {by}')
+    sports, sport_code = _encode(columns['sport'])
+    used, team_code = np.unique(school_code * len(sports) + sport_code, return_inverse=True)
+    labels = [f'{schools[code // len(sports)]} / {sports[code % len(sports)]}' for code in used.tolist()]
+    return np.array(labels), team_code
+
+class DeadlineIndex:
+    """Deadlines sorted by (group, day) in one array
+
+    keys[i] = group * span + (day - first_day), so every group's deadlines form one sorted run
+    and any [start, end) date window within a group is found by two binary searches. rows[i] is
+    the deal's row in the source columns.
+    """
+
+    def __init__(self, groups, keys, rows, first_day, span):
+        self.groups = np.asarray(groups)
+        self.keys = keys
+        self.rows = rows
+        self.first_day = first_day
+        self.span = span
+
+    @classmethod
+    def build(cls, groups, group_code, deadlines):
+        """Index deadlines (datetime64[D]) under sorted group labels and per-deal group codes"""
+        days = np.asarray(deadlines).astype('datetime64[D]').astype(np.int64)
+        first_day = int(days.min()) if len(days) else 0
+        span = (int(days.max()) - first_day + 1) if len(days) else 1
+        keys = group_code.astype(np.int64) * span + (days - first_day)
+        rows = np.argsort(keys, kind='stable')
+        return cls(groups, keys[rows], rows, first_day, span)
+
+    def _day(self, date):
+        """Offset of a date from first_day, clipped to the indexed range"""
+        day = int(np.datetime64(date, 'D').astype(np.int64)) - self.first_day
+        return min(max(day, 0), self.span)
+
+    def bounds(self, start, end, groups=None):
+        """(lo, hi) positions of the deadlines in [start, end) for each group (default: all)"""
+        codes = np.arange(len(self.groups)) if groups is None else np.asarray(groups)
+        base = codes.astype(np.int64) * self.span
+        lo = np.searchsorted(self.keys, base + self._day(start))
+        hi = np.searchsorted(self.keys, base + self._day(end))
+        return lo, hi
+
+    def counts(self, start, end, groups=None):
+        """Number of deadlines in [start, end) per group"""
+        lo, hi = self.bounds(start, end, groups)
+        return hi - lo
+
+    def window(self, start, end, groups=None):
+        """Source rows with a deadline in [start, end), soonest first"""
+        lo, hi = self.bounds(start, end, groups)
+        if not len(lo):
+            return np.zeros(0, dtype=np.int64)
+        positions = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)])
+        positions = positions[np.argsort(self.keys[positions] % self.span, kind='stable')]
+        return self.rows[positions]
+
+    def select(self, school=None):
+        """Codes of all groups, or of one institution's group or teams"""
+        if school is None:
+            return np.arange(len(self.groups))
+        labels = self.groups.astype(str)
+        return np.flatnonzero((labels == school) | np.char.startswith(labels, f'{school} / '))
+
+def track(columns, by='school', as_of=None, days=14, lookback=30, school=None):
+    """Deadline counts per group and the deals due soonest, as of a date (default: today)"""
+    as_of = np.datetime64(as_of or 'today', 'D')
+    deadlines = disclosure_deadlines(columns['deal_date'])
+    index = DeadlineIndex.build(*group_codes(columns, by), deadlines)
+    codes = index.select(school)
+    overdue_start = as_of - np.timedelta64(lookback, 'D')
+    horizons = sorted({*(w for w in WINDOWS if w < days), days})
+    counts = {
+        'overdue': index.counts(overdue_start, as_of, codes),
+        **{h: index.counts(as_of, as_of + np.timedelta64(h, 'D'), codes) for h in horizons},
+    }
+    return {
+        'by': by,
+        'as_of': as_of,
+        'days': days,
+        'lookback': lookback,
+        'horizons': horizons,
+        'groups': index.groups[codes],
+        'counts': counts,
+        'deadlines': deadlines,
+        'overdue_rows': index.window(overdue_start, as_of, codes),
+        'due_rows': index.window(as_of, as_of + np.timedelta64(days, 'D'), codes),
+    }
+
+def _horizon_label(days):
+    return 'Due today' if days == 1 else f'Due in {days} days'
+
+def add_deadline_report(doc, columns, report, title='Disclosure Deadline Tracker', limit=50):
+    """Render deadline counts per group and the overdue and due-soon deals as branded tables"""
+    overview = load_script('generate-partner-overview')
+    label = GROUP_LABELS[report['by']]
+    counts = report['counts']
+    as_of = report['as_of']
+
+    overview.create_heading(doc, title, 1)
+    doc.add_paragraph(
+        f'As of {as_of} • deadlines are {DISCLOSURE_BUSINESS_DAYS} business days after signing • '
+        f'{int(counts["overdue"].sum())} overdue (last {report["lookback"]} days) • '
+        f'{int(counts[report["days"]].sum())} due in the next {report["days"]} days'
+    )
+
+    overview.create_heading(doc, f'Deadlines by {label}', 2)
+    horizons = report['horizons']
+    order = np.lexsort([-counts[horizons[0]], -counts[report['days']], -counts['overdue']])
+    rows = [
+        [report['groups'][g], counts['overdue'][g], *(counts[h][g] for h in horizons)]
+        for g in order if counts['overdue'][g] or counts[report['days']][g]
+    ]
+    if rows:
+        overview.add_table(doc, [label, 'Overdue', *map(_horizon_label, horizons)], rows,
+                           first_col_bold=True, max_rows=overview.TABLE_PAGE_ROWS)
+    else:
+        doc.add_paragraph(f'No deadlines due in the next {report["days"]} days.')
+
+    for heading, key in (('Overdue Disclosures', 'overdue_rows'), ('Due Next', 'due_rows')):
+        deal_rows = report[key][:limit]
+        if not len(deal_rows):
+            continue
+        overview.create_heading(doc, heading, 2)
+        left = (report['deadlines'][deal_rows] - as_of).astype(np.int64)
+        overview.add_table(doc, DEAL_HEADERS, [
+            [
+                columns['deal_id'][i], columns['athlete_id'][i], columns['school'][i], columns['sport'][i],
+                str(columns['deal_date'][i])[:10], str(report['deadlines'][i]), int(days_left),
+                f'${columns["compensation"][i]:,.0f}',
+            ]
+            for i, days_left in zip(deal_rows, left)
+        ], first_col_bold=True, max_rows=overview.TABLE_PAGE_ROWS)
+    return doc
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render a disclosure deadline tracker report')
+    parser.add_argument('deals', help='Deal dataset with deal_date (.jsonl, .csv or .npz)')
+    parser.add_argument('output', help='Output .docx path')
+    parser.add_argument('--by', choices=sorted(GROUP_LABELS), default='school',
+                        help='Group per institution or per team')
+    parser.add_argument('--as-of', help='Report date, YYYY-MM-DD (default: today)')
+    parser.add_argument('--days', type=int, default=14, help='Look-ahead window in days')
+    parser.add_argument('--lookback', type=int, default=30, help='Days of missed deadlines counted as overdue')
+    parser.add_argument('--school', help='Only this institution (and its teams)')
+    parser.add_argument('--limit', type=int, default=50, help='Maximum rows in each deal table')
+    parser.add_argument('--title', default='Disclosure Deadline Tracker', help='Report heading')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    columns = load_columns(args.deals)
+    if 'deal_date' not in columns:
+        parser.error(f'{args.deals} has no deal_date column')
+    loaded = time.perf_counter()
+    report = track(columns, args.by, args.as_of, args.days, args.lookback, args.school)
+    print(f'Indexed {len(columns["deal_date"])} deadlines in {len(report["groups"])} groups '
+          f'in {time.perf_counter() - loaded:.2f}s (load {loaded - start:.2f}s)')
+
+    doc = blank_document()
+    add_deadline_report(doc, columns, report, title=args.title, limit=args.limit)
+    brand(doc).save(args.output)
+    print(f'Report saved to: {args.output} ({time.perf_counter() - start:.2f}s total)')
+    return args.output
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Deal dataset conventions shared by the report generators
+Column names follow the compliance_scores table; weights and thresholds mirror
+lib/compliance/types.ts (DIMENSION_WEIGHTS, STATUS_THRESHOLDS).
+
+A deal record is a flat dict: deal_id, athlete_id, school, sport, compensation, fmv_estimated,
+is_booster_connected, the six *_score columns and optionally total_score and status.
+Synthetic datasets (chatnil_docs.synthetic) add division, platform, followers, total_followers,
+engagement_rate, deal_type, deal_date and the inflated ground-truth flag.
+"""
+
+import csv
+import json
+import math
+
+# (column, label, weight)
+DIMENSIONS = [
+    ('policy_fit_score', 'Policy Fit', 0.30),
+    ('document_score', 'Document Hygiene', 0.20),
+    ('fmv_score', 'FMV Verification', 0.15),
+    ('tax_score', 'Tax Readiness', 0.15),
+    ('brand_safety_score', 'Brand Safety', 0.10),
+    ('guardian_consent_score', 'Guardian Consent', 0.10),
+]
+
+STATUS_GREEN = 80   # 80-100 = Green (Compliant)
+STATUS_YELLOW = 50  # 50-79 = Yellow (Issues to address)
+STATUSES = ['green', 'yellow', 'red']
+STATUS_LABELS = {'green': '🟢 GREEN', 'yellow': '🟡 YELLOW', 'red': '🔴 RED'}
+
+# Compensation above this multiple of fair market value is a pay-for-play red flag
+FMV_RED_FLAG_RATIO = 2.0
+# Smallest FMV estimate lib/compliance/fmv-check.ts gives any deal, however small the audience
+FMV_FLOOR = 100.0
+
+NUMERIC_COLUMNS = (
+    {'compensation', 'fmv_estimated', 'total_score', 'followers', 'total_followers', 'engagement_rate'}
+    | {c for c, _, _ in DIMENSIONS}
+)
+BOOLEAN_COLUMNS = {'is_booster_connected', 'inflated'}
+
+def status_from_score(score):
+    """Map a 0-100 combined score to green/yellow/red"""
+    if score >= STATUS_GREEN:
+        return 'green'
+    if score >= STATUS_YELLOW:
+        return 'yellow'
+    return 'red'
+
+def total_score(deal):
+    """Weighted combined score for one deal, rounded half-up like Math.round in the TypeScript engine"""
+    return math.floor(sum(float(deal[column]) * weight for column, _, weight in DIMENSIONS) + 0.5)
+
+def _coerce(row):
+    """Convert CSV strings to numbers and booleans"""
+    for key, value in row.items():
+        if key in NUMERIC_COLUMNS and value not in (None, ''):
+            row[key] = float(value)
+        elif key in BOOLEAN_COLUMNS and isinstance(value, str):
+            row[key] = value.strip().lower() in ('1', 'true', 'yes')
+    return row
+
+def read_deals(path):
+    """Stream deal records from a .jsonl or .csv file"""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield _coerce(row)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Streaming text extraction from .docx contracts
+word/document.xml is read straight from the zip with iterparse; each body-level block is
+dropped as soon as it has been yielded, so memory stays flat however long the contract is
+and no python-docx object tree is built. Batches run across a worker pool.
+
+Usage:
+    python -m chatnil_docs.extract contracts/*.docx -o contracts.jsonl [-j 8]
+    python -m chatnil_docs.extract contracts/*.docx --text-dir contracts-txt/
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree.ElementTree import ParseError, iterparse
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+import zlib
+
+from docx.oxml.ns import qn
+
+from chatnil_docs.anchors import BODY, BREAK, DOCUMENT_PART, PARAGRAPH, TEXT, TYPE
+
+# What one unreadable file can raise: missing or not a zip, no document part, a corrupt
+# deflate stream or malformed XML. Reported per file instead of ending the batch.
+EXTRACT_ERRORS = (OSError, KeyError, EOFError, zipfile.BadZipFile, zlib.error, ParseError, UnicodeDecodeError)
+
+TAB = qn('w:tab')
+CARRIAGE_RETURN = qn('w:cr')
+TABLE = qn('w:tbl')
+ROW = qn('w:tr')
+CELL = qn('w:tc')
+
+# kind is 'paragraph' or 'cell'; table/row/col locate a cell (None for body paragraphs)
+Block = namedtuple('Block', 'kind text table row col')
+
+def iter_blocks(source):
+    """Yield the body's paragraphs and table cells in document order
+
+    Paragraphs inside a cell are joined with newlines into the cell's text; nested tables are
+    flattened into their enclosing cell.
+    """
+    with zipfile.ZipFile(source) as zf, zf.open(DOCUMENT_PART) as f:
+        body = None
+        tables = -1
+        table_depth = 0
+        row = col = -1
+        cell_text = []
+        paragraph = []
+        for event, elem in iterparse(f, events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                if tag == BODY:
+                    body = elem
+                elif tag == TABLE:
+                    table_depth += 1
+                    if table_depth == 1:
+                        tables += 1
+                        row = -1
+                elif tag == ROW and table_depth == 1:
+                    row += 1
+                    col = -1
+                elif tag == CELL and table_depth == 1:
+                    col += 1
+                    cell_text = []
+                continue
+
+            if tag == TEXT:
+                paragraph.append(elem.text or '')
+            elif tag == TAB:
+                paragraph.append('\t')
+            elif tag == CARRIAGE_RETURN or (tag == BREAK and elem.get(TYPE, 'textWrapping') == 'textWrapping'):
+                paragraph.append('\n')  # page and column breaks carry no text
+            elif tag == PARAGRAPH:
+                text = ''.join(paragraph)
+                paragraph = []
+                if table_depth:
+                    cell_text.append(text)
+                else:
+                    yield Block('paragraph', text, None, None, None)
+            elif tag == CELL and table_depth == 1:
+                yield Block('cell', '\n'.join(cell_text), tables, row, col)
+            elif tag == TABLE:
+                table_depth -= 1
+
+            if body is not None and elem in body:
+                body.remove(elem)  # finished body-level block: drop it so memory stays flat
+            elif tag != BODY:
+                elem.clear()
+
+def extract_text(source):
+    """Plain text of a .docx: one line per paragraph, table cells tab-separated per row"""
+    lines = []
+    current_row = None
+    for block in iter_blocks(source):
+        if block.kind == 'paragraph':
+            current_row = None
+            lines.append(block.text)
+        elif (block.table, block.row) == current_row:
+            lines[-1] += '\t' + block.text.replace('\n', ' ')
+        else:
+            current_row = (block.table, block.row)
+            lines.append(block.text.replace('\n', ' '))
+    return '\n'.join(lines)
+
+def _extract(path):
+    try:
+        return {'path': path, 'text': extract_text(path)}
+    except EXTRACT_ERRORS as e:
+        return {'path': path, 'error': f'{type(e).__name__}: {e}'}
+
+def extract_many(paths, workers=1, chunksize=8):
+    """Extract many files across a process pool, yielding {path, text|error} in input order"""
+    if workers <= 1 or len(paths) <= 1:
+        yield from map(_extract, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_extract, paths, chunksize=chunksize)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Extract text from .docx contracts')
+    parser.add_argument('paths', nargs='+', help='.docx files')
+    parser.add_argument('-o', '--output', help='Write {path, text} records as JSONL (default: stdout)')
+    parser.add_argument('--text-dir', metavar='DIR', help='Write one .txt file per document instead')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.text_dir:
+        os.makedirs(args.text_dir, exist_ok=True)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    count = errors = total_bytes = 0
+    try:
+        for result in extract_many(args.paths, args.jobs):
+            count += 1
+            if 'error' in result:
+                errors += 1
+                print(f'{result["path"]}: {result["error"]}', file=sys.stderr)
+                continue
+            total_bytes += os.path.getsize(result['path'])
+            if args.text_dir:
+                name = os.path.splitext(os.path.basename(result['path']))[0] + '.txt'
+                with open(os.path.join(args.text_dir, name), 'w', encoding='utf-8') as f:
+                    f.write(result['text'])
+            else:
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f'Extracted {count - errors} of {count} documents ({total_bytes / 1e6:.1f} MB) in {elapsed:.2f}s',
+          file=sys.stderr)
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+File helpers shared by the document tools
+Kept free of heavy imports, so the theme, checkpoint and search modules can share them without
+pulling each other in.
+"""
+
+import hashlib
+import os
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 of a file, or None if it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def write_atomic(path, data):
+    """Replace path with data so readers only ever see the old or the new file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def docx_paths(paths):
+    """.docx files named directly or found under directories, as absolute paths"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith('.docx') and not name.startswith('~$'):  # skip Word lock files
+                        yield os.path.abspath(os.path.join(root, name))
+        else:
+            yield os.path.abspath(path)
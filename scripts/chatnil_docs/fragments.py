@@ -0,0 +1,157 @@
+"""
+Precompiled fragments for sections that never change between tenants or runs
+A static section is rendered once to WordprocessingML, keyed by a hash of its builder's
+source and of the helpers, classes and constants it reaches in any chatnil_docs module or
+generator script, and spliced into new documents as copies of the parsed elements.
+Fragments can also be persisted to a cache directory so later processes skip the builders
+entirely.
+"""
+
+import copy
+import hashlib
+import inspect
+import os
+import sys
+import types
+
+import docx
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from lxml import etree
+
+from chatnil_docs import SCRIPTS_DIR
+from chatnil_docs.anchors import section_xml
+
+def _own(value):
+    """True for code in this package or in a generator script next to it"""
+    module = sys.modules.get(getattr(value, '__module__', None) or getattr(value, '__name__', ''))
+    return os.path.abspath(getattr(module, '__file__', None) or os.sep).startswith(SCRIPTS_DIR + os.sep)
+
+def _names(code):
+    """Global and attribute names used by code, including its nested comprehensions and lambdas"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _names(const)
+    return names
+
+def _constant(value):
+    """Stable text for a constant's value, or None if it is not plain data"""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return repr(value)
+    if isinstance(value, etree._Element):
+        return etree.tostring(value).decode('utf-8')
+    if isinstance(value, (tuple, list, set, frozenset)):
+        items = [_constant(item) for item in value]
+        if None in items:
+            return None
+        if isinstance(value, (set, frozenset)):
+            items.sort()
+        return f'{type(value).__name__}({", ".join(items)})'
+    if isinstance(value, dict):
+        items = sorted((_constant(key), _constant(item)) for key, item in value.items())
+        if any(None in pair for pair in items):
+            return None
+        return '{' + ', '.join(f'{key}: {item}' for key, item in items) + '}'
+    return None
+
+def _dependencies(func, seen):
+    """Sources of func and of the functions, classes and constants it reaches
+
+    Code is followed across chatnil_docs modules and the generator scripts, whether imported by
+    name or used as a module attribute (theme.brand), so editing a helper anywhere changes the hash.
+    """
+    func = inspect.unwrap(func)  # lru_cache and other wrappers
+    if func in seen:
+        return []
+    seen.add(func)
+    parts = [inspect.getsource(func)]
+    if isinstance(func, type):
+        methods = (getattr(member, '__func__', member) for member in vars(func).values())
+        code = [method.__code__ for method in methods if isinstance(method, types.FunctionType)]
+        module_globals = sys.modules[func.__module__].__dict__
+    else:
+        code = [func.__code__]
+        module_globals = func.__globals__
+    names = sorted(set().union(*map(_names, code)))
+    for name in names:
+        if name not in module_globals:
+            continue
+        value = module_globals[name]
+        if isinstance(value, types.ModuleType):
+            if _own(value):
+                for attribute in names:
+                    parts.extend(_value(f'{name}.{attribute}', getattr(value, attribute, None), seen))
+        else:
+            parts.extend(_value(name, value, seen))
+    return parts
+
+def _value(name, value, seen):
+    """Dependency parts for one global: followed if it is our code, spelled out if it is data"""
+    if (inspect.isfunction(inspect.unwrap(value)) or inspect.isclass(value)) and _own(value):
+        return _dependencies(value, seen)
+    text = _constant(value)
+    return [] if text is None else [f'{name}={text}']
+
+def source_hash(builder):
+    """Hash of everything that determines a static builder's output"""
+    parts = [f'python-docx {docx.__version__}', *_dependencies(builder, set())]
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+class FragmentCache:
+    """Rendered static sections, held in memory and optionally persisted under cache_dir"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._fragments = {}  # name -> (source hash, parsed <w:body> wrapper)
+        self._hashes = {}  # builder -> source hash; a reloaded script brings new function objects
+        self.rendered = 0
+        self.loaded = 0
+
+    def _path(self, name, digest):
+        return os.path.join(self.cache_dir, f'{name}-{digest[:16]}.xml')
+
+    def _render(self, name, builder, digest):
+        """Body XML for a builder, from disk when a matching fragment was persisted"""
+        path = self._path(name, digest) if self.cache_dir else None
+        if path and os.path.exists(path):
+            self.loaded += 1
+            with open(path, 'rb') as f:
+                return f.read()
+        self.rendered += 1
+        xml = section_xml(builder, None)
+        if path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(xml)
+            os.replace(tmp_path, path)
+        return xml
+
+    def fragment(self, name, builder):
+        """Parsed fragment for a static section, re-rendered if its source changed"""
+        digest = self._hashes.get(builder)
+        if digest is None:
+            digest = self._hashes[builder] = source_hash(builder)
+        cached = self._fragments.get(name)
+        if cached is None or cached[0] != digest:
+            xml = self._render(name, builder, digest)
+            if b' r:id=' in xml or b' r:embed=' in xml:
+                raise ValueError(f'Static section {name} references package relationships')
+            wrapper = parse_xml(f'<w:body {nsdecls("w")}>'.encode('utf-8') + xml + b'</w:body>')
+            cached = self._fragments[name] = (digest, wrapper)
+        return cached[1]
+
+    def splice(self, doc, name, builder):
+        """Append a copy of the static section to the end of doc's body"""
+        sect_pr = doc.element.body.sectPr
+        for element in self.fragment(name, builder):
+            sect_pr.addprevious(copy.deepcopy(element))
+
+    def warm(self, sections):
+        """Render every (name, builder) pair up front, e.g. before forking workers"""
+        for name, builder in sections:
+            self.fragment(name, builder)
+
+# Shared by every build in this process
+default_cache = FragmentCache()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Golden-file regression harness for the generators
+Each variant's document.xml and styles.xml are canonicalized (C14N, rsid and other volatile
+attributes stripped) and hashed. Hashes are compared against goldens/index.json first; the
+stored canonical XML is only loaded and diffed for parts whose hash changed. Golden objects
+are content-addressed and gzipped, so parts shared by many variants are stored once.
+
+Usage:
+    python -m chatnil_docs.golden --update        # record goldens
+    python -m chatnil_docs.golden -j 8            # check every variant
+    python -m chatnil_docs.golden tenant-duke     # check selected variants
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from docx import Document
+from lxml import etree
+import argparse
+import difflib
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import zipfile
+
+from chatnil_docs import SCRIPTS_DIR, load_script
+
+GOLDEN_DIR = os.path.join(SCRIPTS_DIR, 'goldens')
+PARTS = ('word/document.xml', 'word/styles.xml')
+
+W14_NS = 'http://schemas.microsoft.com/office/word/2010/wordml'
+VOLATILE_ATTRS = {f'{{{W14_NS}}}paraId', f'{{{W14_NS}}}textId'}
+RSID_RE = re.compile(r'^rsid', re.IGNORECASE)
+
+# Tenant variants: field overrides merged over the generators' defaults
+TENANTS = {
+    'tenant-acu': {},
+    'tenant-duke': {'school_name': 'Duke University', 'athlete_count': '780', 'sport_count': '27',
+                    'document_date': 'March 2026'},
+    'tenant-ohio-state': {'school_name': 'The Ohio State University', 'athlete_count': '1,000',
+                          'sport_count': '36', 'classification': 'INTERNAL'},
+    'tenant-escaping': {'school_name': 'Smith & Jones <College>', 'document_date': '"Spring" 2026'},
+}
+
+def _build_overview():
+    return load_script('generate-partner-overview').build_document()
+
+def _build_with_stories(fields):
+    doc = load_script('generate-partner-overview').build_document(fields)
+    load_script('add-customer-stories').add_customer_stories(doc, fields)
+    return doc
+
+def variants():
+    """Map of variant name to a zero-argument builder returning a Document"""
+    builders = {
+        'overview': _build_overview,
+        'stories': lambda: load_script('add-customer-stories').add_customer_stories(Document()),
+    }
+    for name, fields in TENANTS.items():
+        builders[name] = lambda fields=fields: _build_with_stories(fields)
+    return builders
+
+def canonicalize(xml):
+    """C14N form of a part with rsids and other volatile attributes removed"""
+    root = etree.fromstring(xml)
+    for el in root.iter():
+        if not isinstance(el.tag, str):
+            continue
+        for attr in list(el.attrib):
+            local = attr.rsplit('}', 1)[-1]
+            if attr in VOLATILE_ATTRS or RSID_RE.match(local):
+                del el.attrib[attr]
+        for child in list(el):
+            if isinstance(child.tag, str) and RSID_RE.match(child.tag.rsplit('}', 1)[-1]):
+                el.remove(child)  # w:rsid in styles, w:rsids in settings
+    return etree.tostring(root, method='c14n')
+
+def render_variant(name):
+    """Build one variant and return {part: (sha256, canonical bytes)}"""
+    buffer = io.BytesIO()
+    variants()[name]().save(buffer)
+    result = {}
+    with zipfile.ZipFile(buffer) as zf:
+        for part in PARTS:
+            canonical = canonicalize(zf.read(part))
+            result[part] = (hashlib.sha256(canonical).hexdigest(), canonical)
+    return name, result
+
+def _object_path(golden_dir, digest):
+    return os.path.join(golden_dir, 'objects', digest[:2], f'{digest}.xml.gz')
+
+def _pretty(canonical):
+    return re.sub(rb'>\s*<', b'>\n<', canonical).decode('utf-8').splitlines()
+
+def diff_part(golden_dir, expected_digest, canonical, label, context=3, limit=200):
+    """Unified diff between a stored golden part and the new canonical XML"""
+    path = _object_path(golden_dir, expected_digest)
+    if not os.path.exists(path):
+        return [f'(golden object {expected_digest} is missing)']
+    with gzip.open(path, 'rb') as f:
+        expected = f.read()
+    lines = list(difflib.unified_diff(
+        _pretty(expected), _pretty(canonical), f'golden/{label}', f'current/{label}', n=context, lineterm=''
+    ))
+    if len(lines) > limit:
+        lines = lines[:limit] + [f'... {len(lines) - limit} more diff lines']
+    return lines
+
+def load_index(golden_dir):
+    path = os.path.join(golden_dir, 'index.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def write_goldens(golden_dir, results, index):
+    """Store canonical parts content-addressed and update the index"""
+    for name, parts in results.items():
+        index[name] = {}
+        for part, (digest, canonical) in parts.items():
+            path = _object_path(golden_dir, digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(gzip.compress(canonical, mtime=0))
+            index[name][part] = digest
+    with open(os.path.join(golden_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def render_all(names, workers=1):
+    """Render variants, in worker processes when workers > 1"""
+    if workers > 1 and len(names) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return dict(pool.map(render_variant, names))
+    return dict(render_variant(name) for name in names)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check generator output against canonicalized goldens')
+    parser.add_argument('variants', nargs='*', help='Variants to check (default: all)')
+    parser.add_argument('--update', action='store_true', help='Record the current output as golden')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--golden-dir', default=GOLDEN_DIR)
+    args = parser.parse_args(argv)
+
+    available = variants()
+    names = args.variants or sorted(available)
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        parser.error(f'Unknown variants: {", ".join(unknown)} (available: {", ".join(sorted(available))})')
+
+    results = render_all(names, args.jobs)
+    index = load_index(args.golden_dir)
+
+    if args.update:
+        write_goldens(args.golden_dir, results, index)
+        print(f'Recorded goldens for {len(results)} variants in {args.golden_dir}')
+        return 0
+
+    failures = 0
+    for name in names:
+        for part, (digest, canonical) in results[name].items():
+            expected = index.get(name, {}).get(part)
+            if expected == digest:
+                continue
+            failures += 1
+            if expected is None:
+                print(f'MISSING {name}: {part} has no golden (run with --update)')
+                continue
+            print(f'CHANGED {name}: {part}')
+            for line in diff_part(args.golden_dir, expected, canonical, f'{name}/{part}'):
+                print(f'    {line}')
+    checked = sum(len(parts) for parts in results.values())
+    print(f'{checked} parts in {len(names)} variants checked, {failures} differ')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+tracemalloc-based memory profiling for document builds
+Pass MemoryProfiler().section as the section_hook of a generator: each section records its
+peak and retained memory plus the top allocation sites, and the report is written as JSON.
+lxml allocates its trees through libxml2 rather than the Python allocator, so each section also
+records the process high-water RSS to catch growth that tracemalloc cannot see.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import resource
+import time
+import tracemalloc
+
+class MemoryProfiler:
+    """Snapshot tracemalloc at each section boundary"""
+
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        self.sections = []
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    @contextmanager
+    def section(self, name):
+        """Measure one section: peak and retained bytes, plus where the retained bytes came from"""
+        before = self._snapshot()
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            current_after, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            top_sites = after.compare_to(before, 'lineno')[:self.top]
+            self.sections.append({
+                'section': name,
+                'seconds': round(elapsed, 6),
+                'peak_bytes': peak - current_before,
+                'retained_bytes': current_after - current_before,
+                'total_bytes': current_after,
+                'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                'top_allocations': [
+                    {
+                        'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+                        'size_diff_bytes': stat.size_diff,
+                        'count_diff': stat.count_diff,
+                    }
+                    for stat in top_sites
+                ],
+            })
+
+    def report(self, **metadata):
+        """Return the profile as a JSON-serializable dict"""
+        return {
+            **metadata,
+            'started_at': self.started_at,
+            'max_section_peak_bytes': max((s['peak_bytes'] for s in self.sections), default=0),
+            'final_traced_bytes': tracemalloc.get_traced_memory()[0],
+            'sections': self.sections,
+        }
+
+    def write_report(self, path, **metadata):
+        """Write the report as JSON; '-' writes to stdout"""
+        text = json.dumps(self.report(**metadata), indent=2)
+        if path == '-':
+            print(text)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        return path
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Content-hashed merging of body content between .docx packages
+Styles, numbering definitions and related parts are keyed by a hash of their definition, so
+merged content reuses what the target already has instead of piling up duplicates; only new
+definitions are copied in, under fresh IDs when they collide. prune_unused() then drops
+custom styles and numbering that nothing references, keeping the package compact after many
+incremental merges.
+
+Usage: python -m chatnil_docs.merge target.docx source.docx -o out.docx [--before-heading TEXT]
+"""
+
+from docx import Document
+from docx.opc.packuri import PackURI
+from docx.opc.part import Part, XmlPart
+from docx.oxml.ns import qn
+from lxml import etree
+import argparse
+import copy
+import hashlib
+import io
+import re
+
+from chatnil_docs.anchors import is_heading
+
+STYLE = qn('w:style')
+STYLE_ID = qn('w:styleId')
+STYLE_REFS = (qn('w:pStyle'), qn('w:rStyle'), qn('w:tblStyle'))
+STYLE_LINKS = (qn('w:basedOn'), qn('w:link'), qn('w:next'))
+NUM = qn('w:num')
+NUM_ID = qn('w:numId')
+NUM_ID_ATTR = qn('w:numId')
+ABSTRACT_NUM = qn('w:abstractNum')
+ABSTRACT_NUM_ID = qn('w:abstractNumId')
+VAL = qn('w:val')
+DOC_PR = qn('wp:docPr')
+R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+# Children and attributes that differ between otherwise identical definitions
+VOLATILE_TAGS = {qn('w:rsid'), qn('w:nsid'), qn('w:tmpl'), qn('w:name')}
+
+def content_hash(element, drop_attrs=()):
+    """SHA-1 over a canonical form of element, ignoring IDs, rsids and names"""
+    el = copy.deepcopy(element)
+    for attr in drop_attrs:
+        el.attrib.pop(attr, None)
+    for child in [c for c in el.iter() if c.tag in VOLATILE_TAGS]:
+        child.getparent().remove(child)
+    return hashlib.sha1(etree.tostring(el, method='c14n')).hexdigest()
+
+def _style_hash(style):
+    return content_hash(style, (STYLE_ID,))
+
+def _abstract_hash(abstract):
+    return content_hash(abstract, (ABSTRACT_NUM_ID,))
+
+class _Merger:
+    """State for merging content from one source document into a target"""
+
+    def __init__(self, target, source, style_conflicts='target'):
+        self.target = target
+        self.source = source
+        self.style_conflicts = style_conflicts
+        self.source_styles = {s.get(STYLE_ID): s for s in source.styles.element.iter(STYLE)}
+        self.target_styles = {s.get(STYLE_ID): s for s in target.styles.element.iter(STYLE)}
+        self.target_style_hashes = {_style_hash(s): sid for sid, s in self.target_styles.items()}
+        self.style_map = {}
+        self.num_map = {}
+        self.rel_map = {}
+        self._target_numbering = None
+        self._drawing_id = None
+
+    # ---- numbering ----
+
+    @property
+    def target_numbering(self):
+        if self._target_numbering is None:
+            self._target_numbering = self.target.part.numbering_part.element
+        return self._target_numbering
+
+    def map_num(self, num_id):
+        """Map a source numId to an equivalent target numId, copying the definition if needed"""
+        if num_id in self.num_map or num_id == '0':
+            return self.num_map.get(num_id, num_id)
+        source_numbering = self.source.part.numbering_part.element
+        num = next((n for n in source_numbering.iter(NUM) if n.get(NUM_ID_ATTR) == num_id), None)
+        if num is None:
+            self.num_map[num_id] = num_id
+            return num_id
+        abstract_id = num.find(ABSTRACT_NUM_ID).get(VAL)
+        abstract = next(a for a in source_numbering.iter(ABSTRACT_NUM) if a.get(ABSTRACT_NUM_ID) == abstract_id)
+
+        numbering = self.target_numbering
+        wanted = _abstract_hash(abstract)
+        target_abstract = next(
+            (a for a in numbering.iter(ABSTRACT_NUM) if _abstract_hash(a) == wanted), None
+        )
+        if target_abstract is None:
+            target_abstract = copy.deepcopy(abstract)
+            new_id = max((int(a.get(ABSTRACT_NUM_ID)) for a in numbering.iter(ABSTRACT_NUM)), default=-1) + 1
+            target_abstract.set(ABSTRACT_NUM_ID, str(new_id))
+            first_num = numbering.find(NUM)
+            if first_num is not None:
+                first_num.addprevious(target_abstract)  # abstractNums must precede nums
+            else:
+                numbering.append(target_abstract)
+        target_abstract_id = target_abstract.get(ABSTRACT_NUM_ID)
+
+        overrides = [etree.tostring(o, method='c14n') for o in num if o.tag != ABSTRACT_NUM_ID]
+        for candidate in numbering.iter(NUM):
+            same_abstract = candidate.find(ABSTRACT_NUM_ID).get(VAL) == target_abstract_id
+            if same_abstract and overrides == [
+                etree.tostring(o, method='c14n') for o in candidate if o.tag != ABSTRACT_NUM_ID
+            ]:
+                self.num_map[num_id] = candidate.get(NUM_ID_ATTR)
+                return self.num_map[num_id]
+
+        new_num = copy.deepcopy(num)
+        new_num.set(NUM_ID_ATTR, str(max((int(n.get(NUM_ID_ATTR)) for n in numbering.iter(NUM)), default=0) + 1))
+        new_num.find(ABSTRACT_NUM_ID).set(VAL, target_abstract_id)
+        numbering.append(new_num)
+        self.num_map[num_id] = new_num.get(NUM_ID_ATTR)
+        return self.num_map[num_id]
+
+    def remap_numbering(self, element):
+        for num_ref in element.iter(NUM_ID):
+            num_ref.set(VAL, self.map_num(num_ref.get(VAL)))
+
+    # ---- styles ----
+
+    def map_style(self, style_id):
+        """Map a source styleId to a target styleId, importing the style (and its bases) if needed"""
+        if style_id in self.style_map:
+            return self.style_map[style_id]
+        style = self.source_styles.get(style_id)
+        if style is None:
+            self.style_map[style_id] = style_id
+            return style_id
+        self.style_map[style_id] = style_id  # guards basedOn/link cycles
+
+        digest = _style_hash(style)
+        if style_id in self.target_styles:
+            if self.style_conflicts == 'target' or _style_hash(self.target_styles[style_id]) == digest:
+                return style_id
+        elif digest in self.target_style_hashes:
+            self.style_map[style_id] = self.target_style_hashes[digest]
+            return self.style_map[style_id]
+
+        new_style = copy.deepcopy(style)
+        new_id = style_id
+        if style_id in self.target_styles:
+            suffix = 2
+            while f'{style_id}{suffix}' in self.target_styles:
+                suffix += 1
+            new_id = f'{style_id}{suffix}'
+            new_style.set(STYLE_ID, new_id)
+            new_style.set(qn('w:customStyle'), '1')
+            name = new_style.find(qn('w:name'))
+            if name is not None:
+                name.set(VAL, f'{name.get(VAL)} ({suffix})')
+        self.style_map[style_id] = new_id
+
+        for link in new_style:
+            if link.tag in STYLE_LINKS:
+                link.set(VAL, self.map_style(link.get(VAL)))
+        self.remap_numbering(new_style)
+        self.target.styles.element.append(new_style)
+        self.target_styles[new_id] = new_style
+        self.target_style_hashes.setdefault(_style_hash(new_style), new_id)
+        return new_id
+
+    def remap_styles(self, element):
+        for ref in element.iter(*STYLE_REFS):
+            ref.set(VAL, self.map_style(ref.get(VAL)))
+
+    # ---- relationships ----
+
+    def map_rel(self, r_id):
+        """Relate the target to the source relationship's part (deduplicated by content hash)"""
+        if r_id in self.rel_map:
+            return self.rel_map[r_id]
+        rel = self.source.part.rels[r_id]
+        target_part = self.target.part
+        if rel.is_external:
+            new_id = target_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+        elif rel.reltype.endswith('/image'):
+            new_id, _ = target_part.get_or_add_image(io.BytesIO(rel.target_part.blob))
+        else:
+            source_part = rel.target_part
+            digest = hashlib.sha1(source_part.blob).digest()
+            existing = next((
+                r.target_part for r in target_part.rels.values()
+                if not r.is_external and r.reltype == rel.reltype
+                and hashlib.sha1(r.target_part.blob).digest() == digest
+            ), None)
+            if existing is None:
+                partname = target_part.package.next_partname(_partname_template(source_part.partname))
+                existing = Part(PackURI(partname), source_part.content_type, source_part.blob, target_part.package)
+            new_id = target_part.relate_to(existing, rel.reltype)
+        self.rel_map[r_id] = new_id
+        return new_id
+
+    def remap_relationships(self, element):
+        for el in element.iter():
+            for attr, value in el.attrib.items():
+                if attr.startswith(R_NS):
+                    el.set(attr, self.map_rel(value))
+            if el.tag == DOC_PR:
+                el.set('id', str(self.next_drawing_id()))
+
+    def next_drawing_id(self):
+        """A fresh wp:docPr id for each drawing merged in, counting up from the target's next id"""
+        # Blocks are remapped before they are inserted, so part.next_id alone would hand every
+        # drawing in a block the same id
+        if self._drawing_id is None:
+            self._drawing_id = self.target.part.next_id
+        else:
+            self._drawing_id += 1
+        return self._drawing_id
+
+    def import_block(self, block):
+        block = copy.deepcopy(block)
+        self.remap_styles(block)
+        self.remap_numbering(block)
+        self.remap_relationships(block)
+        return block
+
+def _partname_template(partname):
+    """next_partname() template for a part like partname: /word/media/image3.png or logo.png ->
+    /word/media/image%d.png or logo%d.png"""
+    escaped = partname.replace('%', '%%')
+    template = re.sub(r'\d*(\.\w+)$', r'%d\1', escaped)
+    return template if '%d' in template else f'{escaped}%d'
+
+def merge_into(target, source, before=None, style_conflicts='target'):
+    """Copy the body of source into target before element `before` (default: at the end)
+
+    style_conflicts decides what happens when both documents define a styleId differently:
+    'target' keeps the target's definition (consistent look), 'rename' imports the source
+    definition under a new ID.
+    """
+    merger = _Merger(target, source, style_conflicts)
+    anchor = before if before is not None else target.element.body.sectPr
+    for block in source.element.body:
+        if block.tag == qn('w:sectPr'):
+            continue
+        anchor.addprevious(merger.import_block(block))
+    return merger
+
+def _referenced(root, tags):
+    return {el.get(VAL) for el in root.iter(*tags)}
+
+def _referencing_roots(doc):
+    """The document and every XML part it relates to: headers, footers, notes, comments, numbering..."""
+    roots = [doc.element]
+    for rel in doc.part.rels.values():
+        if not rel.is_external and isinstance(rel.target_part, XmlPart):
+            roots.append(rel.target_part.element)
+    return roots
+
+def prune_unused(doc):
+    """Drop numbering and custom styles that nothing references; returns counts removed
+
+    References are collected from the whole document part and every XML part related to it, so
+    styles and lists used only in a header, footer, note, comment or numbering level are kept.
+    """
+    roots = _referencing_roots(doc)
+    styles = doc.styles.element
+    by_id = {s.get(STYLE_ID): s for s in styles.iter(STYLE)}
+
+    # Styles reachable from any part, through basedOn/link/next chains
+    used_styles = set().union(*(_referenced(root, STYLE_REFS) for root in roots))
+    pending = list(used_styles)
+    while pending:
+        style = by_id.get(pending.pop())
+        if style is None:
+            continue
+        for link in _referenced(style, STYLE_LINKS) - used_styles:
+            used_styles.add(link)
+            pending.append(link)
+
+    removed_styles = 0
+    for style_id, style in by_id.items():
+        if style.get(qn('w:customStyle')) in ('1', 'true') and style_id not in used_styles:
+            styles.remove(style)
+            removed_styles += 1
+
+    removed_nums = removed_abstracts = 0
+    numbering_part = next(
+        (r.target_part for r in doc.part.rels.values() if r.reltype.endswith('/numbering')), None
+    )
+    if numbering_part is not None:
+        numbering = numbering_part.element
+        used_nums = set().union(*(_referenced(root, (NUM_ID,)) for root in roots))
+        for num in list(numbering.iter(NUM)):
+            if num.get(NUM_ID_ATTR) not in used_nums:
+                numbering.remove(num)
+                removed_nums += 1
+        used_abstracts = _referenced(numbering, (ABSTRACT_NUM_ID,))
+        for abstract in list(numbering.iter(ABSTRACT_NUM)):
+            linked = abstract.find(qn('w:numStyleLink')) is not None or abstract.find(qn('w:styleLink')) is not None
+            if abstract.get(ABSTRACT_NUM_ID) not in used_abstracts and not linked:
+                numbering.remove(abstract)
+                removed_abstracts += 1
+    return {'styles': removed_styles, 'nums': removed_nums, 'abstract_nums': removed_abstracts}
+
+def find_heading(doc, text):
+    """Body-level heading paragraph with the given text, or None"""
+    for block in doc.element.body:
+        if block.tag == qn('w:p') and is_heading(block):
+            if ''.join(t.text or '' for t in block.iter(qn('w:t'))).strip() == text:
+                return block
+    return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merge the body of one .docx into another')
+    parser.add_argument('target', help='Document to merge into')
+    parser.add_argument('source', help='Document whose body is merged in')
+    parser.add_argument('-o', '--output', help='Output path (default: overwrite the target)')
+    parser.add_argument('--before-heading', metavar='TEXT', help='Insert before this heading')
+    parser.add_argument('--style-conflicts', choices=['target', 'rename'], default='target')
+    parser.add_argument('--no-prune', action='store_true', help='Keep unreferenced definitions')
+    args = parser.parse_args(argv)
+
+    target = Document(args.target)
+    before = find_heading(target, args.before_heading) if args.before_heading else None
+    merger = merge_into(target, Document(args.source), before, args.style_conflicts)
+    removed = {} if args.no_prune else prune_unused(target)
+    output = args.output or args.target
+    target.save(output)
+    print(f'Merged {args.source} into {output}: {len(merger.style_map)} styles, '
+          f'{len(merger.num_map)} numbering definitions, {len(merger.rel_map)} relationships mapped')
+    if removed:
+        print(f'Pruned {removed["styles"]} styles, {removed["nums"]} nums, {removed["abstract_nums"]} abstract nums')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Pay-for-play red-flag scanner for contract text
+Every red-flag phrase and entity name is compiled into one trie-shaped regex, so a document
+is scanned in a single pass by the C regex engine no matter how many phrases there are.
+Reason codes and terms mirror lib/compliance (policy-fit, document-hygiene, brand-safety).
+Batches are spread across a process pool; inflated FMV is a numeric check (chatnil_docs.fmv).
+
+Usage:
+    python -m chatnil_docs.redflags contracts/*.docx [--entities boosters.txt] [-o flags.jsonl] [-j 8]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from chatnil_docs.extract import EXTRACT_ERRORS, extract_text
+
+# (reason code, severity, description, phrases)
+RED_FLAGS = [
+    ('PROHIBITED_TERM_PAY_FOR_PLAY', 'red', 'Payment tied to enrollment decisions', [
+        'enrollment', 'enrollment bonus', 'signing bonus', 'commitment payment', 'remain enrolled',
+        'commit to the university', 'transfer to', 'roster spot',
+    ]),
+    ('PERFORMANCE_BASED_COMPENSATION', 'red', 'Compensation tied to athletic performance', [
+        'performance bonus', 'win bonus', 'championship bonus', 'playoff bonus', 'per touchdown',
+        'per win', 'per goal', 'per point scored', 'for each touchdown', 'for each win', 'playing time',
+        'starting lineup', 'statistical milestone', 'statistical milestones', 'all-conference selection',
+    ]),
+    ('BOOSTER_CONNECTED', 'red', 'Booster or collective involvement', [
+        'booster', 'boosters', 'booster club', 'collective', 'nil collective', 'donor', 'donors',
+        'athletic foundation', 'alumni association',
+    ]),
+    ('SCHOOL_AFFILIATED_DEAL', 'red', 'School or athletic department connection', [
+        'athletic department', 'athletics department', 'head coach', 'coaching staff',
+        'athletic director', 'university foundation', 'compliance office approval not required',
+    ]),
+    ('VAGUE_DELIVERABLES', 'orange', 'No clear deliverables or vague requirements', [
+        'as needed', 'as requested', 'to be determined', 'tbd', 'at the discretion of',
+        'other duties', 'general promotion', 'mutually agreed deliverables', 'no specific deliverables',
+    ]),
+    ('PROHIBITED_TERM_EXPLOITATIVE', 'red', 'Rights granted forever without expiration', [
+        'perpetual', 'in perpetuity', 'forever', 'indefinitely', 'irrevocable',
+    ]),
+    ('PROHIBITED_BRAND_CATEGORY_ALCOHOL', 'red', 'Alcohol brand', [
+        'beer', 'wine', 'liquor', 'spirits', 'vodka', 'whiskey', 'bourbon', 'brewery',
+    ]),
+    ('PROHIBITED_BRAND_CATEGORY_TOBACCO', 'red', 'Tobacco brand', ['cigarette', 'cigar', 'smokeless']),
+    ('PROHIBITED_BRAND_CATEGORY_CANNABIS', 'red', 'Cannabis brand', [
+        'marijuana', 'weed', 'thc', 'cbd', 'dispensary',
+    ]),
+    ('PROHIBITED_BRAND_CATEGORY_GAMBLING', 'red', 'Gambling brand', ['casino', 'wager', 'poker', 'slots']),
+    ('PROHIBITED_BRAND_CATEGORY_SPORTS_BETTING', 'red', 'Sports betting brand', [
+        'sportsbook', 'draftkings', 'fanduel', 'betmgm', 'caesars sportsbook', 'sports betting',
+    ]),
+    ('PROHIBITED_BRAND_CATEGORY_VAPING', 'red', 'Vaping brand', ['vape', 'e-cig', 'juul', 'puff bar']),
+    ('CAUTION_BRAND_CATEGORY_SUPPLEMENTS', 'yellow', 'Supplement brand', [
+        'pre-workout', 'creatine', 'bcaa', 'protein powder',
+    ]),
+    ('CAUTION_BRAND_CATEGORY_ENERGY_DRINKS', 'yellow', 'Energy drink brand', [
+        'energy drink', 'redbull', 'red bull', 'celsius', 'rockstar energy', 'monster energy',
+    ]),
+]
+
+SEVERITY_ORDER = {'red': 0, 'orange': 1, 'yellow': 2}
+
+def normalize(phrase):
+    """Lower-case with runs of whitespace collapsed, the form phrases are matched in"""
+    return ' '.join(phrase.lower().split())
+
+def _trie_pattern(node):
+    """Regex for a character trie; shared prefixes are matched once"""
+    branches = [
+        (r'\s+' if char == ' ' else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ''
+    if '' in node:  # a phrase ends here; longer phrases are optional continuations (greedy = longest)
+        return '(?:' + '|'.join(branches) + ')?'
+    return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+class RedFlagScanner:
+    """All red-flag phrases compiled into a single case-insensitive regex"""
+
+    def __init__(self, flags=RED_FLAGS, entities=()):
+        self.flags = {code: (severity, description) for code, severity, description, _ in flags}
+        self.codes = {}  # normalized phrase -> reason codes
+        for code, _, _, phrases in flags:
+            for phrase in phrases:
+                self.codes.setdefault(normalize(phrase), []).append(code)
+        if entities:
+            self.flags.setdefault('BOOSTER_CONNECTED', ('red', 'Booster or collective involvement'))
+            for entity in entities:
+                self.codes.setdefault(normalize(entity), []).append('BOOSTER_CONNECTED')
+
+        trie = {}
+        for phrase in self.codes:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        self.pattern = re.compile(r'(?<!\w)' + _trie_pattern(trie) + r'(?!\w)', re.IGNORECASE)
+
+    def hits(self, text):
+        """Yield (reason code, matched phrase, offset) for every red-flag phrase in one pass"""
+        for match in self.pattern.finditer(text):
+            phrase = normalize(match.group())
+            for code in self.codes.get(phrase, ()):
+                yield code, phrase, match.start()
+
+    def scan(self, text):
+        """Red flags found in text, most severe first: [{code, severity, description, phrases, count}]"""
+        found = {}
+        for code, phrase, _ in self.hits(text):
+            entry = found.setdefault(code, {'code': code, 'phrases': [], 'count': 0})
+            entry['count'] += 1
+            if phrase not in entry['phrases']:
+                entry['phrases'].append(phrase)
+        for entry in found.values():
+            entry['severity'], entry['description'] = self.flags[entry['code']]
+        return sorted(found.values(), key=lambda e: (SEVERITY_ORDER.get(e['severity'], 9), e['code']))
+
+def read_entities(path):
+    """One booster/collective entity name per line; blank lines and # comments are skipped"""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def read_text(path):
+    """Contract text from a .docx (streamed, see chatnil_docs.extract) or plain-text file"""
+    if path.lower().endswith('.docx'):
+        return extract_text(path)
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+_scanner = None
+
+def _init_worker(scanner):
+    global _scanner
+    _scanner = scanner
+
+def _scan_path(path):
+    try:
+        return {'path': path, 'flags': _scanner.scan(read_text(path))}
+    except EXTRACT_ERRORS as e:
+        return {'path': path, 'error': f'{type(e).__name__}: {e}'}
+
+def scan_paths(paths, scanner, workers=1, chunksize=16):
+    """Scan files across a process pool, yielding one result per path in input order"""
+    if workers <= 1 or len(paths) <= 1:
+        _init_worker(scanner)
+        yield from map(_scan_path, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scanner,)) as pool:
+        yield from pool.map(_scan_path, paths, chunksize=chunksize)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scan contract text for pay-for-play red flags')
+    parser.add_argument('paths', nargs='+', help='Contracts (.docx or plain text)')
+    parser.add_argument('--entities', metavar='PATH', help='Extra booster/collective entity names, one per line')
+    parser.add_argument('-o', '--output', help='Write one JSON result per document (JSONL)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    args = parser.parse_args(argv)
+
+    scanner = RedFlagScanner(entities=read_entities(args.entities) if args.entities else ())
+    start = time.perf_counter()
+    totals = {}
+    flagged = errors = 0
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        for result in scan_paths(args.paths, scanner, args.jobs):
+            if out:
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            if 'error' in result:
+                errors += 1
+                print(f'{result["path"]}: {result["error"]}')
+                continue
+            flagged += bool(result['flags'])
+            for flag in result['flags']:
+                totals[flag['code']] = totals.get(flag['code'], 0) + 1
+    finally:
+        if out:
+            out.close()
+
+    print(f'Scanned {len(args.paths)} documents in {time.perf_counter() - start:.2f}s: '
+          f'{flagged} flagged, {errors} unreadable')
+    for code, count in sorted(totals.items(), key=lambda item: -item[1]):
+        print(f'  {code}: {count}')
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
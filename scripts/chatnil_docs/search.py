@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the generated document corpus
+Text is streamed out of each .docx (chatnil_docs.extract) into a SQLite FTS5 index with Porter
+stemming, so "booster collectives" also finds "booster collective". Updates are incremental:
+files whose size and mtime are unchanged are skipped without being opened, regenerated files
+are re-indexed only if their content hash changed, and deleted files are dropped. Queries use
+FTS5 syntax (phrases in quotes, AND/OR/NOT, NEAR) and are ranked by BM25.
+
+Usage:
+    python -m chatnil_docs.search index search.db out/ [more paths...] [-j 8]
+    python -m chatnil_docs.search query search.db '"booster collective"' [--path '*/acu*'] [-n 20]
+"""
+
+from datetime import datetime, timezone
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from chatnil_docs.extract import extract_many
+from chatnil_docs.files import docx_paths, file_sha256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS document_text USING fts5(text, tokenize='porter unicode61');
+"""
+
+COMMIT_EVERY = 500
+
+class SearchIndex:
+    """An FTS5 index of document text keyed by absolute path"""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None)  # transactions are explicit
+        self.db.execute('PRAGMA journal_mode=WAL')
+        try:
+            self.db.executescript(SCHEMA)
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f'SQLite {sqlite3.sqlite_version} was built without FTS5: {e}') from e
+
+    def close(self):
+        self.db.close()
+
+    def update(self, paths, workers=1):
+        """Bring the index in line with the given files and directories; returns per-outcome counts"""
+        stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'errors': 0}
+        rows = self.db.execute('SELECT path, id, mtime_ns, size, sha256 FROM documents')
+        indexed = {path: entry for path, *entry in rows}  # path -> [id, mtime_ns, size, sha256]
+
+        for path in [p for p in indexed if not os.path.exists(p)]:
+            self._remove(indexed.pop(path)[0])
+            stats['removed'] += 1
+
+        stale = {}  # path -> (stat, sha256) for files whose content changed or that are new
+        for path in dict.fromkeys(docx_paths(paths)):
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                print(f'{path}: {type(e).__name__}: {e}', file=sys.stderr)
+                stats['errors'] += 1
+                continue
+            entry = indexed.get(path)
+            if entry and entry[1:3] == [stat.st_mtime_ns, stat.st_size]:
+                stats['unchanged'] += 1
+                continue
+            digest = file_sha256(path)
+            if entry and entry[3] == digest:  # regenerated with identical bytes: only the stat moved
+                self.db.execute('UPDATE documents SET mtime_ns = ?, size = ? WHERE id = ?',
+                                (stat.st_mtime_ns, stat.st_size, entry[0]))
+                stats['unchanged'] += 1
+                continue
+            stale[path] = (stat, digest)
+
+        self.db.execute('BEGIN')
+        try:
+            for count, result in enumerate(extract_many(list(stale), workers), start=1):
+                path = result['path']
+                if 'error' in result:
+                    print(f'{path}: {result["error"]}', file=sys.stderr)
+                    stats['errors'] += 1
+                    continue
+                entry = indexed.get(path)
+                if entry:
+                    self._remove(entry[0])
+                self._add(path, *stale[path], result['text'])
+                stats['updated' if entry else 'added'] += 1
+                if count % COMMIT_EVERY == 0:
+                    self.db.execute('COMMIT')
+                    self.db.execute('BEGIN')
+        finally:
+            # Unreadable files come back as per-file errors above; if anything else ends the run
+            # (a crashed worker, Ctrl-C), keep the documents indexed so far: a re-run skips them
+            if self.db.in_transaction:
+                self.db.execute('COMMIT')
+        return stats
+
+    def _add(self, path, stat, digest, text):
+        cursor = self.db.execute(
+            'INSERT INTO documents (path, mtime_ns, size, sha256, indexed_at) VALUES (?, ?, ?, ?, ?)',
+            (path, stat.st_mtime_ns, stat.st_size, digest, datetime.now(timezone.utc).isoformat()),
+        )
+        self.db.execute('INSERT INTO document_text (rowid, text) VALUES (?, ?)', (cursor.lastrowid, text))
+
+    def _remove(self, doc_id):
+        self.db.execute('DELETE FROM document_text WHERE rowid = ?', (doc_id,))
+        self.db.execute('DELETE FROM documents WHERE id = ?', (doc_id,))
+
+    def search(self, query, limit=20, path_glob=None):
+        """Best matches for an FTS5 query: [{path, snippet, score}], most relevant first"""
+        sql = (
+            "SELECT d.path, snippet(document_text, 0, '[', ']', ' … ', 16), bm25(document_text) "
+            'FROM document_text JOIN documents d ON d.id = document_text.rowid '
+            'WHERE document_text MATCH ?'
+        )
+        params = [query]
+        if path_glob:
+            sql += ' AND d.path GLOB ?'
+            params.append(path_glob)
+        sql += ' ORDER BY bm25(document_text) LIMIT ?'
+        params.append(limit)
+        return [
+            {'path': path, 'snippet': snippet, 'score': round(-score, 3)}
+            for path, snippet, score in self.db.execute(sql, params)
+        ]
+
+    def count(self):
+        return self.db.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Full-text search over generated .docx documents')
+    commands = parser.add_subparsers(dest='command', required=True)
+    index = commands.add_parser('index', help='Add new and changed documents, drop deleted ones')
+    index.add_argument('db', help='Index database (SQLite)')
+    index.add_argument('paths', nargs='+', help='.docx files or directories to scan')
+    index.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Extraction worker processes')
+    query = commands.add_parser('query', help='Search the index')
+    query.add_argument('db', help='Index database (SQLite)')
+    query.add_argument('query', help='FTS5 query, e.g. \'"booster collective" AND school\'')
+    query.add_argument('--path', metavar='GLOB', help='Only documents whose absolute path matches GLOB')
+    query.add_argument('-n', '--limit', type=int, default=20, help='Maximum results')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    search_index = SearchIndex(args.db)
+    try:
+        if args.command == 'index':
+            stats = search_index.update(args.paths, args.jobs)
+            print(f'Indexed {search_index.count()} documents in {time.perf_counter() - start:.2f}s: '
+                  + ', '.join(f'{count} {outcome}' for outcome, count in stats.items()))
+            return 1 if stats['errors'] else 0
+        try:
+            results = search_index.search(args.query, args.limit, args.path)
+        except sqlite3.OperationalError as e:
+            parser.error(f'Bad query {args.query!r}: {e}')
+        elapsed = time.perf_counter() - start
+        for result in results:
+            print(f'{result["score"]:7.2f}  {result["path"]}\n         {" ".join(result["snippet"].split())}')
+        print(f'{len(results)} results in {elapsed * 1000:.1f} ms')
+        return 0
+    finally:
+        search_index.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
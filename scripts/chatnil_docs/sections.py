@@ -0,0 +1,33 @@
+"""
+Selective builds over a generator's section registry
+Each generator registers its sections in document order as (name, builder) pairs, with a map
+of the sections each one depends on. select_sections() expands a selection with everything it
+depends on, transitively, and keeps document order, so a targeted packet (say, only the
+scoring section) runs just the builders it needs.
+"""
+
+import argparse
+
+def parse_selection(text):
+    """Section names from a comma-separated --sections value"""
+    names = tuple(name.strip() for name in text.split(',') if name.strip())
+    if not names:
+        raise argparse.ArgumentTypeError('expected one or more section names')
+    return names
+
+def select_sections(registry, dependencies, names=None):
+    """(name, builder) pairs for names and their dependencies, in registry order (all if names is None)"""
+    if names is None:
+        return list(registry)
+    known = {name for name, _ in registry}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f'Unknown sections: {", ".join(unknown)} (expected {", ".join(n for n, _ in registry)})')
+    selected = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(dependencies.get(name, ()))
+    return [(name, builder) for name, builder in registry if name in selected]
@@ -0,0 +1,129 @@
+"""
+Streaming .docx output to any binary stream
+A DocxStreamWriter writes the package to a BytesIO, socket file or stdout while the document is
+still being built: each finished body block is serialized into word/document.xml and dropped
+from the tree, so the client receives bytes after the first section and nothing touches disk.
+The remaining parts (styles, numbering, relationships, content types) follow once the body is
+complete. Zip order is free in OPC, and entries carry data descriptors so the stream never seeks.
+
+    writer = DocxStreamWriter(sys.stdout.buffer)
+    writer.flush(doc)       # after each section
+    writer.close(doc)       # rest of the body, then every other part
+"""
+
+import zipfile
+
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+from lxml import etree
+
+from chatnil_docs.anchors import SECTION_PROPERTIES
+
+BODY_START = b'<w:body>'
+EMPTY_BODY = b'<w:body/>'
+
+class _CountingStream:
+    """Write-only view of a binary stream that counts bytes; never seekable, so zipfile streams"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def write(self, data):
+        self.count += len(data)
+        return self.stream.write(data)
+
+    def flush(self):
+        flush = getattr(self.stream, 'flush', None)
+        if flush:
+            flush()
+
+class DocxStreamWriter:
+    """Write a python-docx Document to a binary stream section by section
+
+    flush(doc) moves every finished body block out of the tree and into the stream; close(doc)
+    writes what is left and the other package parts. word/document.xml is byte-identical to what
+    doc.save() would write.
+    """
+
+    def __init__(self, stream, compresslevel=None):
+        self.stream = _CountingStream(stream)
+        self.compresslevel = compresslevel
+        self._zip = None
+        self._entry = None
+        self._head = None
+
+    @property
+    def bytes_written(self):
+        return self.stream.count
+
+    def _serialize(self, doc):
+        return etree.tostring(doc.element, encoding='UTF-8', standalone=True)
+
+    def _start(self, doc):
+        """Open the zip and write document.xml up to and including <w:body>"""
+        body = doc.element.body
+        blocks = list(body)
+        for block in blocks:
+            body.remove(block)
+        try:
+            head, found, _ = self._serialize(doc).partition(EMPTY_BODY)
+        finally:
+            body.extend(blocks)
+        if not found:
+            raise ValueError('document.xml has no <w:body> to stream')
+        self._head = head + BODY_START
+        self._zip = zipfile.ZipFile(self.stream, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compresslevel)
+        self._entry = self._zip.open(doc.part.partname.membername, 'w')
+        self._entry.write(self._head)
+
+    def _body_xml(self, doc):
+        """Serialized body content as it appears inside the full document"""
+        xml = self._serialize(doc)
+        if not xml.startswith(self._head):
+            raise ValueError('The document root changed while it was being streamed')
+        return xml[len(self._head):]
+
+    def flush(self, doc):
+        """Write the finished body blocks (all but the trailing sectPr) and drop them from the tree"""
+        if self._zip is None:
+            self._start(doc)
+        body = doc.element.body
+        sect_pr = body[-1] if len(body) and body[-1].tag == SECTION_PROPERTIES else None
+        if len(body) == (sect_pr is not None):
+            return self.bytes_written
+        if sect_pr is not None:
+            body.remove(sect_pr)
+        xml = self._body_xml(doc)
+        self._entry.write(xml[:xml.rindex(b'</w:body>')])
+        for block in list(body):
+            body.remove(block)
+        if sect_pr is not None:
+            body.append(sect_pr)
+        self.stream.flush()
+        return self.bytes_written
+
+    def close(self, doc):
+        """Finish document.xml, write every other part and the zip directory; returns bytes written"""
+        if self._zip is None:
+            self._start(doc)
+        self._entry.write(self._body_xml(doc))
+        self._entry.close()
+
+        package = doc.part.package
+        parts = package.parts
+        for part in parts:
+            part.before_marshal()
+            if part is not doc.part:
+                self._zip.writestr(part.partname.membername, part.blob)
+            if len(part.rels):
+                self._zip.writestr(part.partname.rels_uri.membername, part.rels.xml)
+        self._zip.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        self._zip.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        self._zip.close()
+        self.stream.flush()
+        return self.bytes_written
+
+def write_docx(doc, stream, compresslevel=None):
+    """Write a finished document to a binary stream without a temp file; returns bytes written"""
+    return DocxStreamWriter(stream, compresslevel).close(doc)
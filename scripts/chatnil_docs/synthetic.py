@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic athlete/deal dataset generator for load and scale testing
+Athletes get a school, sport, division and per-platform follower counts; their deals get a
+platform, compensation around the FMV estimate from lib/compliance/fmv-check.ts (a few percent
+padded, often booster-connected) and dimension scores in the deals.py schema. Everything is
+drawn with NumPy in athlete chunks, so millions of rows take seconds and the same seed always
+produces the same file.
+
+The FMV estimate is priced on total_followers (reach across all platforms); followers is the
+count on the deal's own platform. inflated is the ground truth for FMV checkers: compensation
+above FMV_RED_FLAG_RATIO times the estimate.
+
+Usage:
+    python -m chatnil_docs.synthetic deals.jsonl                       # 650 athletes, 22 sports
+    python -m chatnil_docs.synthetic deals.npz --athletes 500000 --schools 16 --seed 7
+Formats: .jsonl, .csv, or .npz (columnar; categorical columns stored as codes + categories).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import csv
+import functools
+import io
+import json
+import os
+import time
+
+import numpy as np
+
+from chatnil_docs.deals import DIMENSIONS, FMV_FLOOR, FMV_RED_FLAG_RATIO
+
+# (sport, share of roster, FMV multiplier from estimateAthleteFMV)
+SPORTS = [
+    ('Football', 0.16, 1.5), ('Basketball', 0.05, 1.4), ('Baseball', 0.07, 1.2), ('Soccer', 0.08, 1.1),
+    ('Volleyball', 0.04, 1.0), ('Softball', 0.05, 1.0), ('Track', 0.10, 0.9), ('Swimming', 0.06, 0.9),
+    ('Tennis', 0.03, 1.1), ('Golf', 0.03, 1.2), ('Hockey', 0.05, 1.1), ('Lacrosse', 0.05, 1.0),
+    ('Wrestling', 0.03, 0.9), ('Gymnastics', 0.03, 1.1), ('Cross Country', 0.04, 1.0), ('Rowing', 0.05, 1.0),
+    ('Field Hockey', 0.02, 1.0), ('Water Polo', 0.02, 1.0), ('Fencing', 0.01, 1.0), ('Rifle', 0.01, 1.0),
+    ('Beach Volleyball', 0.01, 1.0), ('Bowling', 0.01, 1.0),
+]
+DIVISIONS = [('D1', 1.3), ('D2', 1.1), ('D3', 1.0)]
+DIVISION_SHARES = [0.7, 0.2, 0.1]
+# (platform, share of deals, median followers, log-normal sigma)
+PLATFORMS = [
+    ('instagram', 0.55, 3000, 1.3),
+    ('tiktok', 0.30, 1500, 1.8),
+    ('twitter', 0.10, 800, 1.2),
+    ('youtube', 0.05, 150, 2.0),
+]
+DEAL_TYPES = ['social_post', 'appearance', 'endorsement', 'autograph', 'camp', 'licensing']
+FIRST_SCHOOL = 'Atlantic Coast University'
+
+# Athletes per generated chunk (and per unit of parallel work)
+CHUNK_SIZE = 100_000
+
+# Rates behind the FMV estimate in lib/compliance/fmv-check.ts
+FMV_RATE_PER_1K = 10.0
+PADDED_SHARE = 0.03  # deals deliberately paid 2-6x their estimate
+
+COLUMNS = [
+    'deal_id', 'athlete_id', 'school', 'sport', 'division', 'platform', 'followers', 'total_followers',
+    'engagement_rate', 'deal_type', 'deal_date', 'compensation', 'fmv_estimated', 'is_booster_connected',
+    'inflated',
+    *(column for column, _, _ in DIMENSIONS),
+]
+
+def school_names(count):
+    """The persona school first, then numbered conference members"""
+    return [FIRST_SCHOOL] + [f'Conference School {i:02d}' for i in range(2, count + 1)]
+
+def categories(schools=1):
+    """Category labels for each categorical column"""
+    return {
+        'school': school_names(schools),
+        'sport': [name for name, _, _ in SPORTS],
+        'division': [name for name, _ in DIVISIONS],
+        'platform': [name for name, _, _, _ in PLATFORMS],
+        'deal_type': DEAL_TYPES,
+    }
+
+def _athletes(rng, count, school_division):
+    """Per-athlete attributes for one chunk"""
+    shares = np.array([share for _, share, _ in SPORTS])
+    medians = np.array([median for _, _, median, _ in PLATFORMS], dtype=np.float64)
+    sigmas = np.array([sigma for _, _, _, sigma in PLATFORMS])
+    # One shared "popularity" draw keeps an athlete's platforms correlated
+    popularity = rng.normal(0.0, 1.0, count)[:, None]
+    noise = rng.normal(0.0, 1.0, (count, len(PLATFORMS)))
+    followers = np.floor(medians * np.exp(sigmas * (0.8 * popularity + 0.6 * noise)))
+    followers[rng.random(count) < 0.7, 3] = 0  # most athletes have no YouTube channel
+    school = rng.integers(0, len(school_division), count)
+    return {
+        'school': school,
+        'sport': rng.choice(len(SPORTS), count, p=shares / shares.sum()),
+        'division': school_division[school],
+        'followers': followers,
+        'engagement_rate': np.round(np.clip(rng.gamma(4.0, 0.009, count), 0.002, 0.25), 4),
+    }
+
+def estimate_fmv(total_followers, sport, division, engagement_rate):
+    """Vectorized estimateAthleteFMV() from lib/compliance/fmv-check.ts"""
+    sport_multiplier = np.array([multiplier for _, _, multiplier in SPORTS])[sport]
+    division_multiplier = np.array([multiplier for _, multiplier in DIVISIONS])[division]
+    fmv = total_followers / 1000.0 * FMV_RATE_PER_1K * sport_multiplier * division_multiplier
+    fmv *= np.where(engagement_rate > 0.03, 1 + (engagement_rate - 0.03) * 10, 1.0)
+    return np.maximum(fmv, FMV_FLOOR)
+
+def _scores(rng, count, ratio, booster):
+    """Dimension scores (0-100 integers) for one chunk of deals"""
+    fmv_score = np.select(
+        [ratio > 5, ratio > 2.5, ratio > 1.5, ratio < 0.3],
+        [20, 45, 75, 70],
+        100 - rng.integers(0, 11, count),
+    )
+    policy_fit = rng.normal(88, 10, count) - 35 * booster
+    document = rng.beta(6, 1.5, count) * 100
+    document[rng.random(count) < 0.04] = 0  # contract never uploaded
+    brand_safety = np.where(rng.random(count) < 0.92, 100, rng.uniform(0, 70, count))
+    guardian_consent = np.where(rng.random(count) < 0.9, 100, rng.choice([0, 50, 90], count))
+    scores = {
+        'policy_fit_score': policy_fit,
+        'document_score': document,
+        'fmv_score': fmv_score,
+        'tax_score': rng.beta(5, 2, count) * 100,
+        'brand_safety_score': brand_safety,
+        'guardian_consent_score': guardian_consent,
+    }
+    return {column: np.clip(np.rint(values), 0, 100).astype(np.int16) for column, values in scores.items()}
+
+@functools.lru_cache(maxsize=4)
+def _plan(athletes, schools, deals_per_athlete, seed, chunk_size):
+    """School divisions, per-chunk seeds and deal-id offsets shared by every chunk"""
+    root = np.random.SeedSequence(seed)
+    plan_seed, *chunk_seeds = root.spawn(1 + -(-athletes // chunk_size))
+    rng = np.random.default_rng(plan_seed)
+    school_division = rng.choice(len(DIVISIONS), schools, p=DIVISION_SHARES)
+    school_division[0] = 0  # the persona school is D1
+    deal_counts = rng.poisson(deals_per_athlete, athletes)
+    chunk_deals = np.add.reduceat(deal_counts, np.arange(0, athletes, chunk_size)) if athletes else []
+    offsets = np.concatenate([[0], np.cumsum(chunk_deals)])
+    return school_division, deal_counts, chunk_seeds, offsets
+
+def generate_chunk(chunk, athletes=650, schools=1, deals_per_athlete=2.5, seed=0, as_of='2026-01-01',
+                   chunk_size=CHUNK_SIZE):
+    """Column arrays (categorical columns as int codes) for one chunk of athletes and their deals
+
+    Chunks only depend on the arguments, so they can be generated in any order or process.
+    """
+    school_division, deal_counts, chunk_seeds, offsets = _plan(athletes, schools, deals_per_athlete, seed,
+                                                               chunk_size)
+    rng = np.random.default_rng(chunk_seeds[chunk])
+    first = chunk * chunk_size
+    count = min(chunk_size, athletes - first)
+    athlete = _athletes(rng, count, school_division)
+
+    owner = np.repeat(np.arange(count), deal_counts[first:first + count])
+    n = len(owner)
+    platform_shares = np.array([share for _, share, _, _ in PLATFORMS])
+    platform = rng.choice(len(PLATFORMS), n, p=platform_shares)
+    engagement = athlete['engagement_rate'][owner]
+    sport = athlete['sport'][owner]
+    division = athlete['division'][owner]
+
+    total_followers = athlete['followers'].sum(axis=1)[owner]
+    fmv = estimate_fmv(total_followers, sport, division, engagement)
+    compensation = fmv * rng.lognormal(0.0, 0.45, n)
+    padded = rng.random(n) < PADDED_SHARE
+    compensation[padded] *= rng.uniform(2.0, 6.0, padded.sum())
+    booster = rng.random(n) < np.where(padded, 0.4, 0.02)
+    compensation = np.round(compensation, 2)
+    fmv = np.round(fmv, 2)
+
+    columns = {
+        'deal_id': np.arange(offsets[chunk], offsets[chunk] + n),
+        'athlete_id': first + owner,
+        'school': athlete['school'][owner],
+        'sport': sport,
+        'division': division,
+        'platform': platform,
+        'followers': athlete['followers'][owner, platform].astype(np.int64),
+        'total_followers': total_followers.astype(np.int64),
+        'engagement_rate': engagement,
+        'deal_type': rng.integers(0, len(DEAL_TYPES), n),
+        'deal_date': np.datetime64(as_of, 'D') - rng.integers(1, 366, n).astype('timedelta64[D]'),
+        'compensation': compensation,
+        'fmv_estimated': fmv,
+        'is_booster_connected': booster,
+        'inflated': compensation > FMV_RED_FLAG_RATIO * fmv,
+    }
+    columns.update(_scores(rng, n, compensation / fmv, booster))
+    return columns
+
+def chunk_count(athletes, chunk_size=CHUNK_SIZE):
+    """Number of athlete chunks for a dataset"""
+    return -(-athletes // chunk_size)
+
+def generate(athletes=650, schools=1, deals_per_athlete=2.5, seed=0, as_of='2026-01-01', chunk_size=CHUNK_SIZE):
+    """Yield the dataset chunk by chunk"""
+    for chunk in range(chunk_count(athletes, chunk_size)):
+        yield generate_chunk(chunk, athletes, schools, deals_per_athlete, seed, as_of, chunk_size)
+
+def _cents(values):
+    """Split money into whole and cent ints; integer formatting is much cheaper than %.2f"""
+    cents = np.rint(values * 100).astype(np.int64)
+    return (cents // 100).tolist(), (cents % 100).tolist()
+
+def _encoded(values, quote):
+    """Quote each distinct value once and map rows onto the encoded strings"""
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([quote(str(value)) for value in unique], dtype=object)[inverse].tolist()
+
+def format_chunk(columns, labels, kind='jsonl'):
+    """Render one chunk as JSONL or CSV text"""
+    quote = json.dumps if kind == 'jsonl' else _csv_quote
+    formats = []
+    values = []
+    for name in COLUMNS:
+        column = columns[name]
+        if name in labels:
+            encoded = np.array([quote(label) for label in labels[name]], dtype=object)
+            formats.append('%s')
+            values.append(encoded[column].tolist())
+        elif name in ('deal_id', 'athlete_id'):
+            formats.append(f'"{name[0]}%d"' if kind == 'jsonl' else f'{name[0]}%d')
+            values.append(column.tolist())
+        elif name == 'deal_date':
+            formats.append('%s')
+            values.append(_encoded(column, quote))
+        elif name in ('compensation', 'fmv_estimated'):
+            formats.append('%d.%02d')
+            values.extend(_cents(column))
+        elif name == 'engagement_rate':
+            formats.append('0.%04d')  # rates are clipped below 1
+            values.append(np.rint(column * 10000).astype(np.int64).tolist())
+        elif name in ('is_booster_connected', 'inflated'):
+            formats.append('%s')
+            values.append(np.where(column, 'true', 'false').tolist())
+        else:
+            formats.append('%d')
+            values.append(column.tolist())
+    if kind == 'jsonl':
+        row_format = '{' + ', '.join(f'"{name}": {fmt}' for name, fmt in zip(COLUMNS, formats)) + '}\n'
+    else:
+        row_format = ','.join(formats) + '\n'
+    return ''.join(map(row_format.__mod__, zip(*values)))
+
+def _csv_quote(value):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='').writerow([value])
+    return buffer.getvalue()
+
+def _text_chunk(job):
+    """Worker: generate and format one chunk; returns (text, rows)"""
+    chunk, params, kind = job
+    columns = generate_chunk(chunk, **params)
+    return format_chunk(columns, categories(params['schools']), kind), len(columns['deal_id'])
+
+def write_text(path, params, workers=1):
+    """Write the dataset as JSONL or CSV, formatting chunks in parallel; returns the row count"""
+    kind = 'csv' if path.endswith('.csv') else 'jsonl'
+    jobs = [(chunk, params, kind) for chunk in range(chunk_count(params['athletes'], params['chunk_size']))]
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if kind == 'csv':
+            f.write(','.join(COLUMNS) + '\n')
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_text_chunk, jobs)  # in chunk order
+                for text, count in results:
+                    f.write(text)
+                    rows += count
+        else:
+            for job in jobs:
+                text, count = _text_chunk(job)
+                f.write(text)
+                rows += count
+    return rows
+
+def _columns_chunk(job):
+    """Worker: generate one chunk's column arrays"""
+    chunk, params = job
+    return generate_chunk(chunk, **params)
+
+def write_npz(path, params, workers=1):
+    """Write the dataset as one columnar .npz file, generating chunks in parallel; returns the row count"""
+    labels = categories(params['schools'])
+    jobs = [(chunk, params) for chunk in range(chunk_count(params['athletes'], params['chunk_size']))]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_columns_chunk, jobs))  # in chunk order
+    else:
+        chunks = list(map(_columns_chunk, jobs))
+    arrays = {}
+    for name in COLUMNS:
+        values = np.concatenate([columns[name] for columns in chunks])
+        if name in labels:
+            arrays[f'{name}:codes'] = values.astype(np.int32)
+            arrays[f'{name}:categories'] = np.array(labels[name])
+        elif name in ('deal_id', 'athlete_id'):
+            arrays[f'{name}:number'] = values  # expanded to "d123"/"a45" by read_npz
+        else:
+            arrays[name] = values
+    np.savez(path, **arrays)
+    return sum(len(columns['deal_id']) for columns in chunks)
+
+def read_npz(path):
+    """Load a columnar .npz dataset, expanding categorical codes and ids to string arrays"""
+    columns = {}
+    with np.load(path) as data:
+        for key in data.files:
+            name, _, part = key.partition(':')
+            if part == 'codes':
+                columns[name] = data[f'{name}:categories'][data[key]]
+            elif part == 'number':
+                columns[name] = np.char.add(name[0], data[key].astype(str))
+            elif not part:
+                columns[name] = data[key]
+    return columns
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic athlete/deal dataset')
+    parser.add_argument('output', help='Output file (.jsonl, .csv or .npz)')
+    parser.add_argument('--athletes', type=int, default=650, help='Number of athletes (default: 650)')
+    parser.add_argument('--schools', type=int, default=1, help='Number of schools (default: 1)')
+    parser.add_argument('--deals-per-athlete', type=float, default=2.5, help='Mean deals per athlete')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--as-of', default='2026-01-01', help='Deal dates fall in the year before this date')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    args = parser.parse_args(argv)
+    if not args.output.endswith(('.jsonl', '.csv', '.npz')):
+        parser.error('Output must end in .jsonl, .csv or .npz')
+
+    start = time.perf_counter()
+    params = {
+        'athletes': args.athletes, 'schools': args.schools, 'deals_per_athlete': args.deals_per_athlete,
+        'seed': args.seed, 'as_of': args.as_of, 'chunk_size': CHUNK_SIZE,
+    }
+    writer = write_npz if args.output.endswith('.npz') else write_text
+    rows = writer(args.output, params, args.jobs)
+    print(f'Wrote {rows} deals for {args.athletes} athletes to {args.output} '
+          f'({time.perf_counter() - start:.2f}s)')
+    return args.output
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+"""
+Preloaded blank document template
+python-docx parses its default template from disk on every Document() call. After
+preload_template(), blank_document() deep-copies an already parsed tree instead, which is
+about twice as fast and lets forked batch workers share the parsed template copy-on-write.
+"""
+
+import copy
+
+from docx import Document
+
+_template = None
+
+def preload_template():
+    """Parse the default template once for this process and its forked children"""
+    global _template
+    if _template is None:
+        _template = Document()
+    return _template
+
+def blank_document():
+    """A new empty Document: a copy of the preloaded template, or freshly parsed without one"""
+    if _template is None:
+        return Document()
+    return copy.deepcopy(_template)
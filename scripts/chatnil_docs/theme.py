@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+ChatNIL brand theme: one palette, compiled into the document theme
+PALETTE is the single source of the brand colors. apply_palette() compiles it into the theme
+part's color scheme (a:clrScheme), so theme-aware styles (headings, titles) pick it up, and
+bind_theme_colors() tags every run color and cell shading that uses a palette color with the
+matching theme slot (w:themeColor / w:themeFill), keeping the hex value as the fallback.
+Charts refer to the same slots directly (a:schemeClr, see chatnil_docs.charts).
+
+A brand refresh is then a zip-level pass over existing files: recolor() rewrites the theme's
+color scheme and the fallback hex values of theme-bound colors, without rebuilding documents.
+
+Usage:
+    python -m chatnil_docs.theme recolor out/ [more .docx files or directories] --palette refresh.json [-j 8]
+
+where refresh.json maps palette roles to new colors, e.g. {"primary": "0EA5E9", "tint": "F0F9FF"}.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+from docx.shared import RGBColor
+from lxml import etree
+
+from chatnil_docs.files import docx_paths, write_atomic
+
+# Brand palette: role -> hex color
+PALETTE = {
+    'primary': 'F97316',  # ChatNIL orange: headings, table headers
+    'text': '1F2937',     # dark gray: subheadings, body emphasis
+    'muted': '6B7280',    # light gray: captions, secondary text
+    'tint': 'FFF7ED',     # orange tint: banded table rows
+}
+
+# Color scheme slot each role compiles into, and the w:themeColor value that refers to it
+SLOTS = {'primary': 'accent1', 'text': 'dk2', 'muted': 'accent2', 'tint': 'lt2'}
+THEME_COLORS = {
+    'dk1': 'text1', 'lt1': 'background1', 'dk2': 'text2', 'lt2': 'background2',
+    **{f'accent{i}': f'accent{i}' for i in range(1, 7)},
+    'hlink': 'hyperlink', 'folHlink': 'followedHyperlink',
+}
+SCHEME_SLOTS = {
+    **{value: slot for slot, value in THEME_COLORS.items()},
+    'dark1': 'dk1', 'light1': 'lt1', 'dark2': 'dk2', 'light2': 'lt2',
+}
+
+CHATNIL_ORANGE = RGBColor.from_string(PALETTE['primary'])
+DARK_GRAY = RGBColor.from_string(PALETTE['text'])
+LIGHT_GRAY = RGBColor.from_string(PALETTE['muted'])
+ORANGE_TINT = RGBColor.from_string(PALETTE['tint'])
+
+DRAWINGML = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+COLOR = qn('w:color')
+SHADING = qn('w:shd')
+VAL = qn('w:val')
+FILL = qn('w:fill')
+THEME_COLOR = qn('w:themeColor')
+THEME_FILL = qn('w:themeFill')
+
+def _a(tag):
+    return f'{{{DRAWINGML}}}{tag}'
+
+def compile_theme(theme_xml, palette=PALETTE):
+    """Theme part XML with the palette's roles written into its color scheme"""
+    root = etree.fromstring(theme_xml)
+    scheme = root.find(f'.//{_a("clrScheme")}')
+    if scheme is None:
+        raise ValueError('Theme part has no a:clrScheme')
+    scheme.set('name', 'ChatNIL')
+    for role, color in palette.items():
+        slot = scheme.find(_a(SLOTS[role]))
+        for child in list(slot):
+            slot.remove(child)
+        etree.SubElement(slot, _a('srgbClr')).set('val', color.upper())
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+def is_theme_part(name):
+    """True for a theme part's name in a .docx package"""
+    return name.startswith('word/theme/') and name.endswith('.xml')
+
+def brand_theme_part(name, data, palette=PALETTE):
+    """A package part with the palette compiled in if it is a theme part, for zip-level passes"""
+    return compile_theme(data, palette) if is_theme_part(name) else data
+
+def apply_palette(doc, palette=PALETTE):
+    """Compile the palette into the document's theme part"""
+    theme = doc.part.part_related_by(RT.THEME)
+    theme._blob = compile_theme(theme.blob, palette)
+    return doc
+
+def bind_theme_colors(element, palette=PALETTE):
+    """Tag run colors and shading that use a palette color with its theme slot"""
+    theme_colors = {color.upper(): THEME_COLORS[SLOTS[role]] for role, color in palette.items()}
+    for el in element.iter(COLOR, SHADING):
+        value_attr, theme_attr = (VAL, THEME_COLOR) if el.tag == COLOR else (FILL, THEME_FILL)
+        theme_color = theme_colors.get((el.get(value_attr) or '').upper())
+        if theme_color and el.get(theme_attr) is None:
+            el.set(theme_attr, theme_color)
+    return element
+
+def brand(doc, palette=PALETTE):
+    """Compile the palette into doc's theme and bind every palette color in the body to it"""
+    apply_palette(doc, palette)
+    bind_theme_colors(doc.element.body, palette)
+    return doc
+
+# Opening tags of theme-bound colors and shading; tinted or shaded slots keep their fallback
+THEMED_TAG_RE = re.compile(rb'<w:(color|shd)\s[^>]*?w:theme(?:Color|Fill)="(\w+)"[^>]*>')
+FALLBACK_RE = {
+    b'color': re.compile(rb'(\sw:val=")[0-9A-Fa-f]{6}(")'),
+    b'shd': re.compile(rb'(\sw:fill=")[0-9A-Fa-f]{6}(")'),
+}
+
+def refresh_fallbacks(xml, palette):
+    """Rewrite the hex fallbacks of theme-bound colors whose slot the palette changes"""
+    slot_colors = {SLOTS[role]: color.upper().encode('ascii') for role, color in palette.items()}
+
+    def replace(match):
+        tag = match.group(0)
+        color = slot_colors.get(SCHEME_SLOTS.get(match.group(2).decode('ascii')))
+        if color is None or b'w:themeTint=' in tag or b'w:themeShade=' in tag:
+            return tag
+        return FALLBACK_RE[match.group(1)].sub(rb'\g<1>' + color + rb'\g<2>', tag, count=1)
+
+    return THEMED_TAG_RE.sub(replace, xml)
+
+def recolor_package(data, palette):
+    """A .docx package (bytes) recolored at the zip level: theme parts and themed fallbacks"""
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as zin, zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            blob = zin.read(info)
+            name = info.filename
+            if is_theme_part(name):
+                blob = compile_theme(blob, palette)
+            elif name.startswith('word/') and name.endswith('.xml') and b'w:theme' in blob:
+                blob = refresh_fallbacks(blob, palette)
+            zout.writestr(info, blob)
+    return output.getvalue()
+
+def recolor_file(path, palette):
+    """Recolor one .docx in place (atomic replace); returns {path} or {path, error}"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        write_atomic(path, recolor_package(data, palette))
+        return {'path': path}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        return {'path': path, 'error': f'{type(e).__name__}: {e}'}
+
+def _recolor(job):
+    return recolor_file(*job)
+
+def recolor(paths, palette, workers=1, chunksize=8):
+    """Recolor many files across a process pool, yielding results in input order"""
+    unknown = set(palette) - set(SLOTS)
+    if unknown:
+        raise ValueError(f'Unknown palette roles: {", ".join(sorted(unknown))} (expected {", ".join(SLOTS)})')
+    jobs = [(path, palette) for path in paths]
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(_recolor, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_recolor, jobs, chunksize=chunksize)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ChatNIL brand theme tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    refresh = commands.add_parser('recolor', help='Apply a palette to existing documents in place')
+    refresh.add_argument('paths', nargs='+', help='.docx files or directories')
+    refresh.add_argument('--palette', required=True, help=f'JSON mapping roles ({", ".join(SLOTS)}) to hex colors')
+    refresh.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    args = parser.parse_args(argv)
+
+    with open(args.palette, encoding='utf-8') as f:
+        palette = {role: color.lstrip('#') for role, color in json.load(f).items()}
+    paths = list(dict.fromkeys(docx_paths(args.paths)))
+
+    start = time.perf_counter()
+    errors = 0
+    for result in recolor(paths, palette, args.jobs):
+        if 'error' in result:
+            errors += 1
+            print(f'{result["path"]}: {result["error"]}', file=sys.stderr)
+    print(f'Recolored {len(paths) - errors} of {len(paths)} documents in {time.perf_counter() - start:.2f}s')
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
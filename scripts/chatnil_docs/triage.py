@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Top-K "Needs Attention" triage over a stream of scored deals
+Deals are read one record at a time and ranked by status (RED first), the number of severity
+flags (booster connection, FMV above 2x, a disclosure deadline within 2 business days or missed
+in the last 30 days), the combined score (lowest first) and the deadline (most pressing first).
+A bounded min-heap keeps only the K most urgent deals, so memory is O(K) however many records
+stream past and nothing is sorted except the K survivors. The queue is rendered with add_table().
+
+Usage:
+    python -m chatnil_docs.triage deals.jsonl needs-attention.docx [-k 25] [--as-of 2026-01-01]
+"""
+
+from datetime import date
+from functools import lru_cache
+import argparse
+import heapq
+import itertools
+import math
+import time
+
+from chatnil_docs import load_script
+from chatnil_docs.deadlines import disclosure_deadlines
+from chatnil_docs.deals import FMV_RED_FLAG_RATIO, STATUS_LABELS, read_deals, status_from_score, total_score
+from chatnil_docs.template import blank_document
+from chatnil_docs.theme import brand
+
+DEADLINE_ALERT_DAYS = 2  # "Shows deals due in 2 days vs 5 days": flag anything this close or overdue
+LOOKBACK_DAYS = 30  # older deadlines are assumed handled, as in chatnil_docs.deadlines
+STATUS_RANK = {'red': 2, 'yellow': 1, 'green': 0}
+NO_DEADLINE = math.inf
+
+class TopK:
+    """The k items with the largest keys seen so far, in O(k) memory"""
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError(f'k must be at least 1, got {k}')
+        self.k = k
+        self.seen = 0
+        self._heap = []  # (key, tiebreak, item); the root is the least urgent survivor
+        self._order = itertools.count()
+
+    def admits(self, key):
+        """True if an item with this key would enter the queue"""
+        return len(self._heap) < self.k or key > self._heap[0][0]
+
+    def push(self, key, item):
+        """Offer one item; returns False if it did not make the cut"""
+        self.seen += 1
+        if not self.admits(key):
+            return False
+        entry = (key, -next(self._order), item)  # earlier items win ties
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+        return True
+
+    def items(self):
+        """Surviving items, most urgent first"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+@lru_cache(maxsize=4096)
+def _deadline(deal_date):
+    return date.fromisoformat(str(disclosure_deadlines([deal_date[:10]])[0]))
+
+def assess(deal, as_of, lookback=LOOKBACK_DAYS):
+    """(status, combined score, FMV ratio, days to the disclosure deadline, flags) for one deal"""
+    score = deal.get('total_score')
+    score = total_score(deal) if score in (None, '') else float(score)
+    status = status_from_score(score)
+    flags = []
+    if deal.get('is_booster_connected'):
+        flags.append('Booster-connected')
+    fmv = float(deal.get('fmv_estimated') or 0)
+    ratio = float(deal.get('compensation') or 0) / fmv if fmv > 0 else 0.0
+    if ratio > FMV_RED_FLAG_RATIO:
+        flags.append(f'{ratio:.1f}x FMV')
+    days_left = NO_DEADLINE
+    if deal.get('deal_date'):
+        days_left = (_deadline(deal['deal_date']) - as_of).days
+        if days_left < -lookback:
+            days_left = NO_DEADLINE
+        elif days_left < 0:
+            flags.append(f'Disclosure {-days_left}d overdue')
+        elif days_left <= DEADLINE_ALERT_DAYS:
+            flags.append(f'Disclosure due in {days_left}d')
+    return status, score, ratio, days_left, flags
+
+def triage(deals, k=25, as_of=None, lookback=LOOKBACK_DAYS):
+    """Stream deals through a bounded heap; returns the TopK queue of {deal, assessment} items"""
+    as_of = as_of or date.today()
+    queue = TopK(k)
+    for deal in deals:
+        status, score, ratio, days_left, flags = assess(deal, as_of, lookback)
+        key = (STATUS_RANK[status], len(flags), -score, -days_left)
+        queue.push(key, {
+            'deal': deal, 'status': status, 'score': score, 'ratio': ratio, 'days_left': days_left, 'flags': flags,
+        })
+    return queue
+
+def add_triage_report(doc, queue, title='Needs Attention'):
+    """Render the triage queue as a ranked, branded table"""
+    overview = load_script('generate-partner-overview')
+    items = queue.items()
+    overview.create_heading(doc, title, 1)
+    doc.add_paragraph(f'Top {len(items)} of {queue.seen} deals: RED first, then most flags, lowest score '
+                      f'and nearest disclosure deadline')
+    if not items:
+        doc.add_paragraph('No deals to review.')
+        return doc
+    rows = []
+    for rank, item in enumerate(items, start=1):
+        deal = item['deal']
+        days_left = item['days_left']
+        rows.append([
+            rank, deal.get('athlete_id', ''), deal.get('deal_id', ''), deal.get('school', ''), deal.get('sport', ''),
+            f'{item["score"]:.0f}', STATUS_LABELS[item['status']], '; '.join(item['flags']) or '-',
+            '-' if days_left == NO_DEADLINE else days_left,
+        ])
+    overview.add_table(
+        doc, ['#', 'Athlete', 'Deal', 'School', 'Sport', 'Score', 'Status', 'Flags', 'Days Left'],
+        rows, first_col_bold=True, max_rows=overview.TABLE_PAGE_ROWS,
+    )
+    return doc
+
+def _queue_size(text):
+    try:
+        k = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected a whole number, got {text!r}') from None
+    if k < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {k}')
+    return k
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render the top-K "Needs Attention" triage queue')
+    parser.add_argument('deals', help='Scored deals (.jsonl or .csv), read as a stream')
+    parser.add_argument('output', help='Output .docx path')
+    parser.add_argument('-k', type=_queue_size, default=25, help='Number of deals to surface')
+    parser.add_argument('--as-of', type=date.fromisoformat, help='Report date, YYYY-MM-DD (default: today)')
+    parser.add_argument('--lookback', type=int, default=LOOKBACK_DAYS,
+                        help='Days a missed disclosure deadline stays flagged as overdue')
+    parser.add_argument('--title', default='Needs Attention', help='Report heading')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    queue = triage(read_deals(args.deals), args.k, args.as_of, args.lookback)
+    print(f'Triaged {queue.seen} deals in {time.perf_counter() - start:.2f}s')
+
+    doc = blank_document()
+    add_triage_report(doc, queue, title=args.title)
+    brand(doc).save(args.output)
+    print(f'Report saved to: {args.output} ({time.perf_counter() - start:.2f}s total)')
+    return args.output
+
+if __name__ == '__main__':
+    main()
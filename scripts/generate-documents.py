@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Run a manifest of ChatNIL document generation jobs
+Usage: python scripts/generate-documents.py jobs.toml -j 8 [--summary summary.json]
+"""
+
+import sys
+
+from chatnil_docs.batch import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,24 +4,50 @@ Generate ChatNIL Partner Overview Document
 Professional Word document for stakeholders, investors, and school administrators
 """
 
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
+from docx.shared import Emu, Inches, Pt, RGBColor, Twips
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.enum.style import WD_STYLE_TYPE
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.oxml.ns import nsdecls, qn
+from docx.oxml import OxmlElement, parse_xml
+from contextlib import nullcontext, redirect_stdout
+import argparse
+import copy
 import os
-
-# ChatNIL brand color
-CHATNIL_ORANGE = RGBColor(249, 115, 22)  # #F97316
-DARK_GRAY = RGBColor(31, 41, 55)  # #1F2937
-LIGHT_GRAY = RGBColor(107, 114, 128)  # #6B7280
+import sys
+
+from chatnil_docs.fragments import FragmentCache, default_cache
+from chatnil_docs.memprofile import MemoryProfiler
+from chatnil_docs.sections import parse_selection, select_sections
+from chatnil_docs.streaming import DocxStreamWriter
+from chatnil_docs.template import blank_document
+from chatnil_docs.textmetrics import fit_columns, measure
+from chatnil_docs.theme import CHATNIL_ORANGE, DARK_GRAY, LIGHT_GRAY, ORANGE_TINT, apply_palette, bind_theme_colors
+from chatnil_docs.tracing import Tracer, annotate, span, traced_hook
+
+# Mail-merge fields (see chatnil_docs.mailmerge); pass {{field}} placeholders to build a template
+DEFAULT_FIELDS = {
+    'document_date': 'January 2026',
+    'classification': 'CONFIDENTIAL',
+}
+
+# Rows per table segment for add_table(max_rows=...); roughly one page of single-line rows
+TABLE_PAGE_ROWS = 40
+
+# Table text is set in TABLE_FONT on every run, so column widths measured in it match what Word
+# renders (the template's body font is its theme minor font, Cambria); each cell adds the Table
+# Grid style's left and right cell margins
+TABLE_FONT = ('Calibri', 11)
+TABLE_CELL_MARGINS = 2 * 108  # twips
+
+DEFAULT_OUTPUT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docs', 'ChatNIL_Platform_Overview.docx'
+)
 
 def set_cell_shading(cell, color):
-    """Set cell background color"""
+    """Set cell background color (an RGBColor or hex string)"""
     shading = OxmlElement('w:shd')
-    shading.set(qn('w:fill'), color)
+    shading.set(qn('w:fill'), str(color))
     cell._tc.get_or_add_tcPr().append(shading)
 
 def add_page_break(doc):
@@ -55,42 +81,108 @@ def add_bullet_list(doc, items, bold_first_part=False):
         else:
             p.add_run(item)
 
-def add_table(doc, headers, rows, first_col_bold=False):
-    """Add a formatted table"""
+def set_repeat_table_header(row):
+    """Mark a table row as a header row repeated at the top of each page"""
+    tbl_header = OxmlElement('w:tblHeader')
+    tbl_header.set(qn('w:val'), 'true')
+    row._tr.get_or_add_trPr().append(tbl_header)
+
+def table_column_widths(doc, headers, rows, first_col_bold=False):
+    """Column widths in twips that fill the text width, measured from the header and cell text"""
+    font, size = TABLE_FONT
+    section = doc.sections[-1]
+    available = Emu(section.page_width - section.left_margin - section.right_margin).twips
+    natural, minimum = [], []
+    for col_idx, header in enumerate(headers):
+        bold = first_col_bold and col_idx == 0
+        extents = [measure(header, font, size, True)]
+        extents.extend(measure(str(row[col_idx]), font, size, bold) for row in rows if col_idx < len(row))
+        natural.append(max(line for line, _ in extents) * 20 + TABLE_CELL_MARGINS)
+        minimum.append(max(word for _, word in extents) * 20 + TABLE_CELL_MARGINS)
+    return fit_columns(natural, minimum, available)
+
+def set_table_widths(table, widths):
+    """Fix the table grid to widths (twips) so Word lays it out without an autofit pass"""
+    table.autofit = False
+    tbl_width = table._tbl.tblPr.find(qn('w:tblW'))
+    tbl_width.set(qn('w:type'), 'dxa')
+    tbl_width.set(qn('w:w'), str(sum(widths)))
+    for column, width in zip(table.columns, widths):
+        column.width = Twips(width)
+    for cell, width in zip(table.rows[0].cells, widths):
+        cell.width = Twips(width)  # rows added later copy their cell widths from the grid
+
+def _table_run_properties(bold):
+    """w:rPr for table text in TABLE_FONT; built once, copied into each run (far cheaper than run.font)"""
+    name, size = TABLE_FONT
+    return parse_xml(
+        f'<w:rPr {nsdecls("w")}><w:rFonts w:ascii="{name}" w:hAnsi="{name}"/>{"<w:b/>" if bold else ""}'
+        f'<w:sz w:val="{size * 2}"/></w:rPr>'
+    )
+
+TABLE_RUN_PROPERTIES = {bold: _table_run_properties(bold) for bold in (False, True)}
+
+def _add_cell_text(cell, text, bold=False):
+    """Write text into an empty table cell as one run in TABLE_FONT"""
+    run = cell.paragraphs[0].add_run(text)
+    run._r.insert(0, copy.deepcopy(TABLE_RUN_PROPERTIES[bold]))
+    return run
+
+def _add_table_segment(doc, headers, rows, first_col_bold, row_offset, repeat_header, widths):
+    """Add one table with a header row; row_offset keeps the banding continuous across segments"""
     table = doc.add_table(rows=1, cols=len(headers))
     table.style = 'Table Grid'
     table.alignment = WD_TABLE_ALIGNMENT.CENTER
+    set_table_widths(table, widths)
 
     # Header row
     header_cells = table.rows[0].cells
     for i, header in enumerate(headers):
-        header_cells[i].text = header
-        for paragraph in header_cells[i].paragraphs:
-            for run in paragraph.runs:
-                run.bold = True
-                run.font.color.rgb = RGBColor(255, 255, 255)
-        set_cell_shading(header_cells[i], 'F97316')
+        run = _add_cell_text(header_cells[i], header, bold=True)
+        run.font.color.rgb = RGBColor(255, 255, 255)
+        set_cell_shading(header_cells[i], CHATNIL_ORANGE)
+    if repeat_header:
+        set_repeat_table_header(table.rows[0])
 
     # Data rows
-    for row_idx, row_data in enumerate(rows):
-        row = table.add_row()
+    for row_idx, row_data in enumerate(rows, start=row_offset):
+        cells = table.add_row().cells
         for col_idx, cell_text in enumerate(row_data):
-            row.cells[col_idx].text = str(cell_text)
-            if first_col_bold and col_idx == 0:
-                for paragraph in row.cells[col_idx].paragraphs:
-                    for run in paragraph.runs:
-                        run.bold = True
+            _add_cell_text(cells[col_idx], str(cell_text), bold=first_col_bold and col_idx == 0)
             # Alternating row colors
             if row_idx % 2 == 0:
-                set_cell_shading(row.cells[col_idx], 'FFF7ED')
+                set_cell_shading(cells[col_idx], ORANGE_TINT)
 
-    doc.add_paragraph()  # Space after table
     return table
 
-def create_document():
-    doc = Document()
-
-    # ==================== COVER PAGE ====================
+def add_table(doc, headers, rows, first_col_bold=False, max_rows=None):
+    """Add a formatted table
+
+    Column widths are measured from the text (table_column_widths) and fixed, the same in every
+    segment. With max_rows, tables longer than that are split into page-sized segments, each
+    starting on a new page with a repeating header row. Returns the table, or the list of segment tables.
+    """
+    rows = list(rows)
+    with span('table', 'table', rows=len(rows), columns=len(headers), first_header=headers[0] if headers else ''):
+        widths = table_column_widths(doc, headers, rows, first_col_bold)
+        if not max_rows or len(rows) <= max_rows:
+            table = _add_table_segment(doc, headers, rows, first_col_bold, 0, False, widths)
+            doc.add_paragraph()  # Space after table
+            return table
+
+        tables = []
+        for start in range(0, len(rows), max_rows):
+            if start:
+                add_page_break(doc)  # Also keeps Word from joining adjacent tables
+            tables.append(_add_table_segment(
+                doc, headers, rows[start:start + max_rows], first_col_bold, start, True, widths
+            ))
+        annotate(segments=len(tables))
+        doc.add_paragraph()  # Space after table
+        return tables
+
+def add_cover_page(doc, fields):
+    """Cover page: logo, title, subtitle, date and classification"""
     doc.add_paragraph()
     doc.add_paragraph()
     doc.add_paragraph()
@@ -130,7 +222,7 @@ def create_document():
     # Date
     p = doc.add_paragraph()
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run('January 2026')
+    run = p.add_run(fields['document_date'])
     run.font.size = Pt(14)
     run.font.color.rgb = LIGHT_GRAY
 
@@ -139,13 +231,12 @@ def create_document():
     # Confidential notice
     p = doc.add_paragraph()
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run('CONFIDENTIAL')
+    run = p.add_run(fields['classification'])
     run.font.size = Pt(12)
     run.font.color.rgb = LIGHT_GRAY
 
-    add_page_break(doc)
-
-    # ==================== TABLE OF CONTENTS ====================
+def add_table_of_contents(doc, fields):
+    """Table of contents"""
     create_heading(doc, 'Table of Contents', 1)
 
     toc_items = [
@@ -165,9 +256,8 @@ def create_document():
         p.add_run('\t' * 6)
         p.add_run(page)
 
-    add_page_break(doc)
-
-    # ==================== EXECUTIVE SUMMARY ====================
+def add_executive_summary(doc, fields):
+    """Executive Summary"""
     create_heading(doc, 'Executive Summary', 1)
 
     p = doc.add_paragraph()
@@ -215,9 +305,8 @@ def create_document():
         'and why our compliance scoring carries weight.'
     )
 
-    add_page_break(doc)
-
-    # ==================== SECTION 1: THE PROBLEM WE SOLVE ====================
+def add_problem_section(doc, fields):
+    """Section 1: The Problem We Solve"""
     create_heading(doc, 'Section 1: The Problem We Solve', 1)
 
     create_heading(doc, 'The Current NIL Mess', 2)
@@ -272,9 +361,8 @@ def create_document():
         'legitimate third-party NIL. Every deal is scored, documented, and defensible.'
     )
 
-    add_page_break(doc)
-
-    # ==================== SECTION 2: HIGH SCHOOL STUDENT EXPERIENCE ====================
+def add_high_school_section(doc, fields):
+    """Section 2: High School Student Experience"""
     create_heading(doc, 'Section 2: High School Student Experience', 1)
 
     create_heading(doc, 'WHAT', 2)
@@ -392,9 +480,8 @@ def create_document():
         'No messaging (no one to message)'
     ])
 
-    add_page_break(doc)
-
-    # ==================== SECTION 3: COLLEGE ATHLETE EXPERIENCE ====================
+def add_college_athlete_section(doc, fields):
+    """Section 3: College Athlete Experience"""
     create_heading(doc, 'Section 3: College Athlete Experience', 1)
 
     create_heading(doc, 'WHAT', 2)
@@ -512,9 +599,8 @@ def create_document():
         'No messaging (no one to message)'
     ])
 
-    add_page_break(doc)
-
-    # ==================== SECTION 4: PARENT EXPERIENCE ====================
+def add_parent_section(doc, fields):
+    """Section 4: Parent Experience"""
     create_heading(doc, 'Section 4: Parent Experience', 1)
 
     create_heading(doc, 'WHAT', 2)
@@ -601,9 +687,8 @@ def create_document():
         'Any marketplace or deal features'
     ])
 
-    add_page_break(doc)
-
-    # ==================== SECTION 5: COMPLIANCE OFFICER EXPERIENCE ====================
+def add_compliance_officer_section(doc, fields):
+    """Section 5: Compliance Officer Experience"""
     create_heading(doc, 'Section 5: Compliance Officer Experience', 1)
 
     create_heading(doc, 'WHAT', 2)
@@ -761,9 +846,8 @@ def create_document():
         'Marketplace features'
     ])
 
-    add_page_break(doc)
-
-    # ==================== SECTION 6: THE 6-DIMENSION SCORING SYSTEM ====================
+def add_scoring_section(doc, fields):
+    """Section 6: The 6-Dimension Scoring System"""
     create_heading(doc, 'Section 6: The 6-Dimension Scoring System', 1)
 
     p = doc.add_paragraph()
@@ -927,9 +1011,8 @@ def create_document():
         first_col_bold=True
     )
 
-    add_page_break(doc)
-
-    # ==================== SECTION 7: WHY CHATNIL? ====================
+def add_why_chatnil_section(doc, fields):
+    """Section 7: Why ChatNIL?"""
     create_heading(doc, 'Section 7: Why ChatNIL?', 1)
 
     create_heading(doc, 'For Schools', 2)
@@ -996,13 +1079,153 @@ def create_document():
     run.font.color.rgb = CHATNIL_ORANGE
     p.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
+
+SECTIONS = [
+    ('cover', add_cover_page),
+    ('toc', add_table_of_contents),
+    ('executive_summary', add_executive_summary),
+    ('problem', add_problem_section),
+    ('high_school', add_high_school_section),
+    ('college_athlete', add_college_athlete_section),
+    ('parent', add_parent_section),
+    ('compliance_officer', add_compliance_officer_section),
+    ('scoring', add_scoring_section),
+    ('why_chatnil', add_why_chatnil_section),
+]
+
+# Sections each section needs alongside it in a selective build (chatnil_docs.sections). The
+# table of contents lists every section heading with its page, so it needs the whole document.
+# Bulleted lists (add_bullet_list) and headings use the template's built-in styles and numbering
+# definitions, which blank_document() brings along before any section runs, so no section
+# depends on another for them.
+SECTION_DEPENDENCIES = {
+    'toc': tuple(name for name, _ in SECTIONS if name != 'toc'),
+}
+
+# Sections identical for every tenant and run; spliced from precompiled fragments
+STATIC_SECTIONS = ('executive_summary', 'problem', 'scoring', 'why_chatnil')
+
+def build_document(fields=None, section_hook=None, fragments=default_cache, writer=None, sections=None,
+                   store=None):
+    """Build the overview document, filling in mail-merge fields
+
+    section_hook(name), if given, must return a context manager that wraps each section build.
+    sections, if given, names the sections to build; their dependencies are built too.
+    STATIC_SECTIONS are copied from the fragments cache; pass fragments=None to run every builder.
+    store, a chatnil_docs.content_store.StoredSections, supplies the sections it holds for its
+    audience and tenant and leaves out those it tags for other audiences.
+    With a DocxStreamWriter, each finished section is streamed out and dropped from the tree.
+    Brand colors are bound to the compiled theme (chatnil_docs.theme) as the body is built.
+    """
+    fields = {**DEFAULT_FIELDS, **(fields or {})}
+    section_hook = traced_hook(section_hook)
+    with section_hook('open'):
+        doc = apply_palette(blank_document())
+
+    selected = select_sections(SECTIONS, SECTION_DEPENDENCIES, sections)
+    if store is not None:
+        selected = [(name, builder) for name, builder in selected if not store.excludes(name)]
+    for index, (name, builder) in enumerate(selected):
+        with section_hook(name):
+            if index:
+                add_page_break(doc)
+            if store is not None and name in store:
+                store.splice(doc, name, fields)
+            elif fragments is not None and name in STATIC_SECTIONS:
+                fragments.splice(doc, name, builder)
+            else:
+                builder(doc, fields)
+            if writer is not None:
+                bind_theme_colors(doc.element.body)
+                writer.flush(doc)
+
+    if writer is None:
+        bind_theme_colors(doc.element.body)
+    return doc
+
+def create_document(output_path=DEFAULT_OUTPUT_PATH, fields=None, section_hook=None, fragments=default_cache,
+                    sections=None, store=None):
+    """Build the overview document and save it to output_path (a path or a writable binary stream)"""
+    if hasattr(output_path, 'write'):
+        writer = DocxStreamWriter(output_path)
+        doc = build_document(fields, section_hook, fragments, writer, sections, store)
+        with traced_hook(section_hook)('save'):
+            annotate(bytes=writer.close(doc))
+        print(f'Document streamed ({writer.bytes_written} bytes)')
+        return output_path
+
+    doc = build_document(fields, section_hook, fragments, sections=sections, store=store)
+
     # Save the document
-    output_dir = '/Users/verrelbricejr./ChatNIL.io/docs'
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, 'ChatNIL_Platform_Overview.docx')
-    doc.save(output_path)
+    with traced_hook(section_hook)('save'):
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        doc.save(output_path)
+        annotate(bytes=os.path.getsize(output_path))
     print(f'Document saved to: {output_path}')
     return output_path
 
+def parse_field(text):
+    """Parse a --field NAME=VALUE argument"""
+    name, sep, value = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f'Expected NAME=VALUE, got {text!r}')
+    return name, value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the ChatNIL Partner Overview document')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT_PATH,
+                        help='Output .docx path, or - to stream to stdout (default: docs/ChatNIL_Platform_Overview.docx)')
+    parser.add_argument('--field', action='append', type=parse_field, default=[], metavar='NAME=VALUE',
+                        help=f'Mail-merge field override ({", ".join(DEFAULT_FIELDS)}); repeatable')
+    parser.add_argument('--mem-profile', metavar='REPORT',
+                        help='Write per-section tracemalloc stats as JSON to REPORT (- for stdout, stderr with -o -)')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write timing spans as a Chrome trace (.json) or JSONL (.jsonl)')
+    parser.add_argument('--tenant', help='Tenant ID recorded on every trace span (and used with --content-store)')
+    parser.add_argument('--content-store', metavar='DB',
+                        help='Take sections from this content store (chatnil_docs.content_store) where it has them')
+    parser.add_argument('--audience', help='With --content-store, leave out sections tagged for other audiences')
+    parser.add_argument('--fragment-cache', metavar='DIR',
+                        help='Persist precompiled static sections in DIR for reuse across runs')
+    parser.add_argument('--no-fragments', action='store_true',
+                        help='Run every section builder instead of splicing precompiled static sections')
+    parser.add_argument('--sections', type=parse_selection, metavar='NAME,...',
+                        help=f'Build only these sections and what they depend on ({", ".join(n for n, _ in SECTIONS)})')
+    args = parser.parse_args(argv)
+    try:
+        select_sections(SECTIONS, SECTION_DEPENDENCIES, args.sections)
+    except ValueError as e:
+        parser.error(str(e))
+    store = None
+    if args.content_store:
+        from chatnil_docs.content_store import open_sections
+        try:
+            store = open_sections(args.content_store, 'overview', args.audience, args.tenant or '')
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+    elif args.audience:
+        parser.error('--audience needs --content-store')
+
+    if args.no_fragments:
+        fragments = None
+    else:
+        fragments = FragmentCache(args.fragment_cache) if args.fragment_cache else default_cache
+    profiler = MemoryProfiler() if args.mem_profile else None
+    tracer = Tracer(script='generate-partner-overview', tenant=args.tenant)
+    to_stdout = args.output == '-'
+    output = sys.stdout.buffer if to_stdout else args.output
+    # Streaming to stdout: progress messages go to stderr so the package bytes stay clean
+    with tracer.activate(), redirect_stdout(sys.stderr) if to_stdout else nullcontext():
+        create_document(output, dict(args.field), section_hook=profiler.section if profiler else None,
+                        fragments=fragments, sections=args.sections, store=store)
+    output_path = args.output
+    if args.trace:
+        tracer.write(args.trace)
+    if profiler:
+        # With the document on stdout, a '-' report goes to stderr instead of trailing the package
+        with redirect_stdout(sys.stderr) if to_stdout else nullcontext():
+            profiler.write_report(args.mem_profile, script='generate-partner-overview', output=output_path)
+    return output_path
+
 if __name__ == '__main__':
-    create_document()
+    main()